@@ -0,0 +1,117 @@
+import asyncio
+
+from lexer import Lexer, TokenType
+from parser import Parser
+from grammar_parser import REPORTED_ERRORS, SCRIPT_ERRORS, Interpreter, error_text
+from type_checker import TypeChecker
+from error_handler import RagarRuntimeError
+
+CLOSE_TIMEOUT = 1.0  # Seconds a finished session waits to flush its output
+
+class AsyncInterpreter(Interpreter):
+    """Runs a RAGAR script with 'ask'/'put' bound to asyncio streams.
+
+    Every session owns its parser position and variables, so any number of
+    them can share one event loop (and one token list).
+    """
+
+    def __init__(self, parser, reader, writer, encoding="utf-8", limits=None, checked=None):
+        super().__init__(parser, limits, checked)
+        self.reader = reader
+        self.writer = writer
+        self.encoding = encoding
+        # Statements that await I/O; everything else runs through dispatch()
+        self.async_statements = {"put": self.put, "ask": self.ask, "if": self.run_if}
+
+    async def interpret(self):
+        self.start_budget()
+        self.declare_functions()
+        remaining = None if self.budget is None else self.budget.remaining()
+        if remaining is None:
+            await self.run_statements()
+            return
+        # Statement boundaries only check the deadline between statements;
+        # this also cuts off a session stalled in readline() or drain()
+        try:
+            await asyncio.wait_for(self.run_statements(), remaining)
+        except asyncio.TimeoutError:
+            raise self.budget.deadline_exceeded() from None
+
+    async def run_statements(self):
+        try:
+            while self.parser.current_token.type != TokenType.EOF:
+                await self.run_statement()
+        except SCRIPT_ERRORS as e:
+            raise RagarRuntimeError(error_text(e)) from e
+
+    def write_output(self, text):
+        # Used by 'put' inside func bodies, which run synchronously; the
+        # buffered bytes are drained once the calling statement finishes
+        self.writer.write((text + "\n").encode(self.encoding))
+
+    def read_input(self):
+        raise SyntaxError("'ask' inside a func is not supported in async sessions")
+
+    async def run_statement(self):
+        self.tick()
+        token = self.parser.current_token
+        handler = self.async_statements.get(token.value)
+        if handler is not None:
+            await handler()
+        else:
+            self.dispatch(token)  # Statements without I/O stay synchronous
+            if self.writer.transport.get_write_buffer_size():
+                await self.writer.drain()  # Output from func calls
+
+    async def put(self):
+        self.writer.write((self.resolve_put() + "\n").encode(self.encoding))
+        await self.writer.drain()  # Wait here while the peer is not reading
+
+    async def ask(self):
+        var_name = self.parser.parse_ask()
+        line = await self.reader.readline()  # b"" on EOF
+        self.store_variable(var_name, line.decode(self.encoding).rstrip("\r\n"))
+
+    async def run_if(self):
+        if self.select_branch():
+            await self.run_block()
+            self.parser.skip_else_chain()
+
+    async def run_block(self):
+        end = self.open_block()
+        if end is None:
+            await self.run_statement()
+            return
+        while self.parser.pos < end:
+            await self.run_statement()
+        self.parser.eat(TokenType.SYMBOL)  # Eat '}'
+
+async def run_session(tokens, reader, writer, limits=None, matches=None, checked=None):
+    """Runs one script session over a reader/writer pair, then closes the writer."""
+    interpreter = AsyncInterpreter(Parser(tokens, matches), reader, writer, limits=limits, checked=checked)
+    try:
+        await interpreter.interpret()
+    except REPORTED_ERRORS as e:
+        writer.write(f"Error: {e}\n".encode(interpreter.encoding))
+    except ConnectionError:
+        pass  # Peer went away mid-session
+    finally:
+        writer.close()
+        try:
+            # A peer that stopped reading must not hold the session open
+            await asyncio.wait_for(writer.wait_closed(), CLOSE_TIMEOUT)
+        except asyncio.TimeoutError:
+            writer.transport.abort()
+        except ConnectionError:
+            pass
+
+async def serve(source_code, host="127.0.0.1", port=8765, limits=None):
+    """Serves a script over TCP; every connection gets its own session and budget."""
+    lexer = Lexer(source_code)
+    tokens = lexer.tokenize()  # Lex and type check once, share between sessions
+    checked = TypeChecker(tokens, lexer.matches).check()
+
+    async def handle(reader, writer):
+        await run_session(tokens, reader, writer, limits, lexer.matches, checked)
+
+    return await asyncio.start_server(handle, host, port)
@@ -1,39 +1,48 @@
-from error_handler import John, LongSyntaxError, VariableDeclarationError, ControlFlowException
-from lexer import Lexer
+from linker import load_program
 from parser import Parser
-from grammar_parser import Interpreter
+from grammar_parser import REPORTED_ERRORS, Interpreter
 import sys
 
 class ContextManager:
-    def __init__(self, file_path):
+    def __init__(self, file_path, limits=None, check=False):
         self.file_path = file_path
-        self.error_handler = John()
-        
+        self.limits = limits
+        self.check = check  # Type check first, and run with the checker's fast paths
+
+    def load(self):
+        """Links the file and its imported modules into one ProgramImage."""
+        return load_program(self.file_path)
+
     def run(self):
-        """Reads the file and executes Lexing -> Parsing -> Interpreting with error handling."""
+        """Reads the file and executes Lexing -> Parsing -> Interpreting with error handling.
+
+        Returns a process exit code.
+        """
         try:
-            global source_code
-            with open(self.file_path, 'r') as file:
-                source_code = file.read()
-                
-            lexer = Lexer(source_code)
-            tokens = lexer.tokenize()
-            
-            parser = Parser(tokens)
-            parser.parse()
-            interpreter = Interpreter(parser)
+            program = self.load()
+            checked = None
+            if self.check:
+                from type_checker import TypeChecker
+                checked = TypeChecker(program.tokens, program.matches).check()
+                if not checked.ok:
+                    for error in checked.errors:
+                        print(f"{self.file_path}: token {error.pos}: {error}", file=sys.stderr)
+                    return 1
+
+            parser = Parser(program.tokens, program.matches)
+            interpreter = Interpreter(parser, self.limits, checked)
             interpreter.interpret()
-        except:
-            pass
-    
+        except (OSError, *REPORTED_ERRORS) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        return 0
+
 if __name__ == "__main__":
-    # import sys
-    
-    # if len(sys.argv) != 2:
-    #     print("Usage: python context_manager.py <file.rgr>")
-    #     sys.exit(1)
-    
-    # file_path = sys.argv[1]
-    
-    manager = ContextManager("example.rgr")
-    manager.run()
+    if len(sys.argv) != 2:
+        print("Usage: python context_manager.py <file.rgr>")
+        sys.exit(1)
+
+    file_path = sys.argv[1]
+
+    manager = ContextManager(file_path)
+    sys.exit(manager.run())
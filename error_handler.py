@@ -0,0 +1,39 @@
+class ResourceLimitError(Exception):
+    """Base class for a script exceeding one of its ExecutionLimits."""
+
+    def __init__(self, message, limit=None, used=None):
+        super().__init__(message)
+        self.limit = limit
+        self.used = used
+
+class StatementLimitExceeded(ResourceLimitError):
+    """Raised when a run executes more statements than allowed."""
+
+class DeadlineExceeded(ResourceLimitError):
+    """Raised when a run goes past its wall-clock deadline."""
+
+class OutputLimitExceeded(ResourceLimitError):
+    """Raised when 'put' output grows past the allowed number of bytes."""
+
+class ValueSizeLimitExceeded(ResourceLimitError):
+    """Raised when stored variables grow past the allowed total size."""
+
+class TypeCheckError(Exception):
+    """A static type error found before execution, at token index `pos`."""
+
+    def __init__(self, message, pos=None):
+        super().__init__(message)
+        self.pos = pos
+
+class RagarRuntimeError(Exception):
+    """Raised when a script fails while running, e.g. dividing by zero in a condition."""
+
+class ControlFlowException(Exception):
+    """Base class for exceptions used to unwind RAGAR control flow."""
+
+class ReturnSignal(ControlFlowException):
+    """Carries a 'return' value out of a func body to its caller."""
+
+    def __init__(self, value):
+        super().__init__()
+        self.value = value
@@ -0,0 +1,119 @@
+from lexer import TokenType
+from parser import compile_expression, condition_source
+from literals import literal_value
+
+FRAME_POOL_SIZE = 64  # Idle frames kept per function for reuse
+UNSET = object()  # Marks a slot with no value yet; None is a real value
+
+class Frame:
+    """Variables of one func call: a fixed slot array, falling back to globals.
+
+    Frames are mappings so conditions and return expressions can be
+    evaluated against them directly.
+    """
+
+    __slots__ = ("function", "slots", "globals")
+
+    def __init__(self, function, globals_):
+        self.function = function
+        self.slots = [UNSET] * len(function.slot_names)
+        self.globals = globals_
+
+    def __getitem__(self, name):
+        index = self.function.slot_index.get(name)
+        if index is not None:
+            value = self.slots[index]
+            if value is not UNSET:
+                return value
+        return self.globals[name]
+
+    def __setitem__(self, name, value):
+        index = self.function.slot_index.get(name)
+        if index is None:
+            self.globals[name] = value
+        else:
+            self.slots[index] = value
+
+    def __contains__(self, name):
+        index = self.function.slot_index.get(name)
+        if index is not None and self.slots[index] is not UNSET:
+            return True
+        return name in self.globals
+
+class FunctionDef:
+    """A declared func: its parameters, local slot layout and frame pool."""
+
+    def __init__(self, name, params, body_pos, tokens, matches, globals_, pure=False):
+        self.name = name
+        self.params = params
+        self.arity = len(params)
+        self.body_pos = body_pos  # Index of the body's '{'
+        self.pure = pure
+        self.globals = globals_
+        self.memo = None  # lru_cache wrapper, installed by the interpreter for pure funcs
+
+        # Parameters take the first slots, then every name the body declares
+        self.slot_names = list(params)
+        for index in range(body_pos + 1, matches[body_pos]):
+            token = tokens[index]
+            if token.type == TokenType.KEYWORD and token.value in ("var", "ask"):
+                target = tokens[index + 2] if token.value == "ask" else tokens[index + 1]
+                if target.type == TokenType.IDENTIFIER and target.value not in self.slot_names:
+                    self.slot_names.append(target.value)
+        self.slot_index = {slot: index for index, slot in enumerate(self.slot_names)}
+        self.empty_slots = [UNSET] * len(self.slot_names)
+        self.free_frames = []
+
+    def acquire_frame(self):
+        """Takes a cleared frame from the pool, or builds one."""
+        if self.free_frames:
+            return self.free_frames.pop()
+        return Frame(self, self.globals)
+
+    def release_frame(self, frame):
+        """Clears a frame and returns it to the pool."""
+        frame.slots[:] = self.empty_slots
+        if len(self.free_frames) < FRAME_POOL_SIZE:
+            self.free_frames.append(frame)
+
+    def cache_info(self):
+        """Memoization hits/misses for a pure func, None otherwise."""
+        return self.memo.cache_info() if self.memo is not None else None
+
+class CallSite:
+    """A call bound to its function, with its arity checked and arguments
+    pre-decoded once: literals to values, expressions to code objects.
+    """
+
+    __slots__ = ("function", "native", "literals", "names", "expressions", "names_used", "end")
+
+    def __init__(self, function, arg_items, end, native=None):
+        if len(arg_items) != function.arity:
+            raise TypeError(f"{function.name}() takes {function.arity} arguments but {len(arg_items)} were given")
+        self.function = function  # FunctionDef, or NativeFunction for built-ins
+        self.native = native      # Bound Python callable for built-ins
+        self.literals = [None] * function.arity
+        self.names = []        # (argument index, variable name) looked up per call
+        self.expressions = []  # (argument index, code object) evaluated per call
+        for index, item in enumerate(arg_items):
+            if len(item) > 1:
+                code = compile_expression(condition_source(item), "<argument>")
+                self.expressions.append((index, code))
+            elif item[0].type == TokenType.IDENTIFIER:
+                self.names.append((index, item[0].value))
+            else:
+                self.literals[index] = literal_value(item[0])
+        self.names_used = {name for _, name in self.names}
+        for _, code in self.expressions:
+            self.names_used.update(code.co_names)
+        self.end = end  # Token index just past the call's ')'
+
+    def arguments(self, scope, globals_):
+        if not self.names and not self.expressions:
+            return self.literals
+        args = list(self.literals)
+        for index, name in self.names:
+            args[index] = scope[name]
+        for index, code in self.expressions:
+            args[index] = eval(code, globals_, scope)
+        return args
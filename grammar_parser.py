@@ -0,0 +1,387 @@
+import sys
+
+from lexer import TokenType
+from parser import CALL_TOKENS, REPEAT, SAFE_BUILTINS, Call, compile_expression, condition_source
+from limits import Budget
+from functions import FunctionDef, CallSite
+from literals import LazyLiteral, format_value, is_type
+from error_handler import RagarRuntimeError, ResourceLimitError, ReturnSignal
+
+# Argument types a pure func can be memoized on
+HASHABLE_TYPES = {int, float, str, bool}
+# Python errors a script can cause (a missing key, int("abc"), an
+# undefined name); reported as RagarRuntimeError instead of a traceback
+SCRIPT_ERRORS = (ArithmeticError, LookupError, ValueError, NameError, AttributeError)
+
+# Errors a run reports to the user as "Error: ..." rather than a traceback
+REPORTED_ERRORS = (SyntaxError, TypeError, RecursionError, RagarRuntimeError, ResourceLimitError)
+
+def error_text(error):
+    return f"{type(error).__name__}: {error}"
+
+class Interpreter:
+    def __init__(self, parser, limits=None, checked=None, memo_size=256):
+        self.parser = parser
+        self.variables = {}
+        self.scope = self.variables  # Current Frame while inside a func call
+        self.functions = {}
+        self.call_sites = {}  # Call name token index -> CallSite
+        self.natives = {}     # Imported built-in name -> (NativeFunction, bound callable)
+        # Funcs and built-ins callable from expressions; no other Python built-ins
+        self.eval_globals = {"__builtins__": SAFE_BUILTINS, REPEAT: self.repeat}
+        self.returns = {}     # 'return' token index -> compiled expression
+        self.lazy_names = set()  # Variables that were assigned a LazyLiteral
+        self.memo_size = memo_size
+        # A passing TypeChecker result lets declarations and conditions skip
+        # their run-time conversion and compilation
+        self.trusted = checked is not None and checked.ok
+        if self.trusted:
+            self.declarations = checked.declarations
+            self.conditions = checked.conditions
+            self.typed_calls = checked.typed_calls
+        else:
+            self.declarations = {}
+            self.conditions = {}
+            self.typed_calls = set()
+        # Statement keyword -> handler, looked up once per statement
+        self.statements = {
+            "import": self.execute_import,
+            "var": self.execute_variable_declaration,
+            "put": self.execute_put,
+            "ask": self.execute_ask,
+            "if": self.execute_if,
+            "func": self.execute_function_declaration,
+            "pure": self.execute_function_declaration,
+            "return": self.execute_return,
+        }
+        self.limits = limits
+        self.budget = None
+        self.ticks = sys.maxsize  # Statements left before the next budget check
+
+    def start_budget(self):
+        """Starts accounting for a run against self.limits, if any."""
+        if self.limits is not None:
+            self.budget = Budget(self.limits)
+            self.ticks = 0  # Force a check before the first statement
+
+    def declare_functions(self):
+        """Defines every top-level func before the program runs, so a call may
+        precede the declaration (as the type checker allows)."""
+        start = self.parser.pos
+        for pos in self.parser.top_level_functions():
+            self.parser.jump(pos)
+            try:
+                self.define_function(*self.parser.parse_function_declaration())
+            except SyntaxError:
+                continue  # Raised again when the declaration itself runs
+        self.parser.jump(start)
+
+    def interpret(self):
+        self.start_budget()
+        self.declare_functions()
+        try:
+            while self.parser.current_token.type != TokenType.EOF:
+                self.execute_statement()
+        except SCRIPT_ERRORS as e:
+            raise RagarRuntimeError(error_text(e)) from e
+
+    def evaluate_condition(self, condition):
+        """Evaluates a condition (source or code object) using interpreter's variables."""
+        if isinstance(condition, str):
+            condition = compile_expression(condition, "<condition>")
+        if self.lazy_names:
+            self.materialize(condition.co_names)
+        try:
+            return eval(condition, self.eval_globals, self.scope)
+        except (ResourceLimitError, RecursionError):
+            raise  # Limits hit by funcs called from the condition still end the run
+        except Exception as e:
+            raise RagarRuntimeError(f"Condition failed: {e}") from e
+
+    def repeat(self, left, right):
+        """'left * right', sizing a repeated string or list against the budget first."""
+        if self.budget is not None:
+            sequence, count = (right, left) if isinstance(left, int) else (left, right)
+            if isinstance(count, int) and hasattr(sequence, "__len__"):
+                # Item size of a list or packed list; a character of a string
+                item_size = 1 if isinstance(sequence, str) else 8
+                self.budget.check_value_size(len(sequence) * max(count, 0) * item_size)
+        return left * right
+
+    def write_output(self, text):
+        """Sends one line of 'put' output to the session."""
+        print(text)
+
+    def emit(self, text):
+        """Outputs a line on behalf of a built-in, charging it to the budget."""
+        if self.budget is not None:
+            self.budget.charge_output(text)
+        self.write_output(text)
+
+    def read_input(self):
+        """Reads one line of 'ask' input from the session."""
+        try:
+            return input()
+        except EOFError:
+            return ""
+
+    def store_variable(self, var_name, value):
+        """Stores a variable, charging its size to the run's budget."""
+        self.scope[var_name] = value
+        if isinstance(value, LazyLiteral):
+            self.lazy_names.add(var_name)
+        if self.budget is not None:
+            # Frame locals are keyed by frame, and released when the call returns
+            local = self.scope is not self.variables and var_name in self.scope.function.slot_index
+            key = (id(self.scope), var_name) if local else var_name
+            self.budget.charge_value(key, value)
+
+    def materialize(self, names):
+        """Decodes any lazy literals among `names` before they are read."""
+        for name in names:
+            if name in self.lazy_names and name in self.scope:
+                value = self.scope[name]
+                if isinstance(value, LazyLiteral):
+                    self.store_variable(name, value.decode())
+
+    def tick(self):
+        """Counts one statement; the budget is only consulted once per window."""
+        self.ticks -= 1
+        if self.ticks < 0:
+            self.ticks = self.budget.refill() - 1
+
+    def execute_statement(self):
+        self.tick()
+        self.dispatch(self.parser.current_token)
+
+    def dispatch(self, token):
+        """Runs the statement starting at `token`."""
+        handler = self.statements.get(token.value)
+        if handler is not None:
+            handler()
+        elif token.type in CALL_TOKENS:
+            self.execute_call()
+        else:
+            raise SyntaxError(f"Unexpected token: {token}")
+
+    def execute_import(self):
+        from libraries import LIBRARIES, type_checked
+        mod = self.parser.parse_import()
+        library = LIBRARIES.get(mod)
+        if library is None:
+            # .rgr modules are spliced in by the linker; anything left is missing
+            raise SyntaxError(f"Module not found: {mod}")
+        # Bind every built-in now, so a call only costs the bound call itself
+        for name, native in library.functions.items():
+            fn = native.bind(self)
+            self.natives[name] = (native, fn)
+            self.eval_globals[name] = type_checked(native, fn)  # Calls in expressions are not type checked
+        self.call_sites.clear()  # Imported names may shadow earlier bindings
+
+    def execute_variable_declaration(self):
+        declaration = self.declarations.get(self.parser.pos)
+        if declaration is not None:
+            var_name, var_value, next_pos = declaration  # Converted by the type checker
+            self.parser.jump(next_pos)
+            self.store_variable(var_name, var_value)
+            return
+
+        var_name, var_type, var_value = self.parser.parse_variable_declaration()
+
+        if isinstance(var_value, Call):
+            call = var_value
+            var_value = self.call(call)
+            # Func results are untyped, so even a type checked run has to look
+            if not is_type(var_value, var_type):
+                raise TypeError(f"{var_name} is {var_type} but {call.name}() returned {format_value(var_value)}")
+        # Ensure var_value is not the type name ("int") by mistake
+        elif var_type == "int":
+            try:
+                var_value = int(var_value)  # Convert the value to an integer
+            except ValueError:
+                raise SyntaxError(f"Invalid integer value for variable {var_name}: {var_value}")
+
+        # Store the actual value in the variable storage
+        self.store_variable(var_name, var_value)
+
+    def resolve_put(self):
+        """Parses a 'put' statement and returns the text to output."""
+        value = self.parser.parse_put()
+        if value in self.scope:
+            if value in self.lazy_names:
+                self.materialize((value,))
+            text = format_value(self.scope[value])  # Ensure variable values are printed
+        else:
+            text = str(value)
+        if self.budget is not None:
+            self.budget.charge_output(text)
+        return text
+
+    def execute_put(self):
+        self.write_output(self.resolve_put())
+
+    def execute_ask(self):
+        var_name = self.parser.parse_ask()
+        self.store_variable(var_name, self.read_input())
+
+    def evaluate_if(self):
+        """Parses an if header and evaluates its condition."""
+        open_pos = self.parser.pos + 1  # Index of '('
+        code = self.conditions.get(open_pos)
+        if code is not None:
+            self.parser.jump(self.parser.matches[open_pos] + 1)  # Compiled by the type checker
+            return self.evaluate_condition(code)
+
+        condition_tokens = self.parser.parse_if_statement()
+        code = self.conditions[open_pos] = compile_expression(condition_source(condition_tokens), "<condition>")
+        return self.evaluate_condition(code)
+
+    def select_branch(self):
+        """Evaluates an if/elif/else chain, jumping over untaken branches.
+
+        Returns True with the parser positioned at the body of the taken
+        branch, or False with the parser past the whole chain.
+        """
+        if self.evaluate_if():
+            return True
+        self.parser.skip_block()
+        while self.parser.at("elif"):
+            if self.evaluate_if():
+                return True
+            self.parser.skip_block()
+        if self.parser.at("else"):
+            self.parser.eat(TokenType.KEYWORD)  # Eat 'else'
+            return True
+        return False
+
+    def execute_if(self):
+        """Executes an if statement by evaluating the condition."""
+        if self.select_branch():
+            self.execute_block()
+            self.parser.skip_else_chain()
+
+    def open_block(self):
+        """Enters a '{ ... }' block and returns the index of its '}'.
+
+        Returns None when the body is a single statement instead.
+        """
+        if not self.parser.at("{"):
+            return None
+        end = self.parser.matches[self.parser.pos]
+        self.parser.eat(TokenType.SYMBOL)  # Eat '{'
+        return end
+
+    def execute_block(self):
+        """Executes a '{ ... }' block or a single statement."""
+        end = self.open_block()
+        if end is None:
+            self.execute_statement()
+            return
+        while self.parser.pos < end:
+            self.execute_statement()
+        self.parser.eat(TokenType.SYMBOL)  # Eat '}'
+
+    def execute_function_declaration(self):
+        name, params, body_pos, pure = self.parser.parse_function_declaration()
+        defined = self.functions.get(name)
+        if defined is None or defined.body_pos != body_pos:  # Top-level funcs are already defined
+            self.define_function(name, params, body_pos, pure)
+
+    def define_function(self, name, params, body_pos, pure):
+        function = FunctionDef(name, params, body_pos, self.parser.tokens,
+                               self.parser.matches, self.variables, pure)
+        if pure:
+            from functools import lru_cache, partial
+            # typed: pair(1, 2) and pair(1.0, 2.0) must not share a result
+            function.memo = lru_cache(maxsize=self.memo_size, typed=True)(partial(self.invoke, function))
+        if name in self.functions:
+            self.call_sites.clear()  # Bound call sites point at the old definition
+        self.functions[name] = function
+
+        def call_from_expression(*args):
+            if len(args) != function.arity:
+                raise TypeError(f"{name}() takes {function.arity} arguments but {len(args)} were given")
+            return self.apply(function, *args)
+        self.eval_globals[name] = call_from_expression
+
+    def bind(self, call):
+        """Binds a parsed call to its function once; later calls reuse the CallSite."""
+        function = self.functions.get(call.name)
+        if function is not None:
+            site = CallSite(function, call.args, call.end)
+        elif call.name in self.natives:
+            native, fn = self.natives[call.name]
+            if call.pos not in self.typed_calls:
+                from libraries import type_checked
+                fn = type_checked(native, fn)  # The type checker has not vouched for the arguments
+            site = CallSite(native, call.args, call.end, fn)
+        else:
+            raise SyntaxError(f"Undefined func: {call.name}")
+        self.call_sites[call.pos] = site
+        return site
+
+    def call(self, call):
+        """Evaluates a parsed Call and returns its result."""
+        site = self.call_sites.get(call.pos) or self.bind(call)
+        return self.call_site(site)
+
+    def call_site(self, site):
+        if self.lazy_names:
+            self.materialize(site.names_used)
+        args = site.arguments(self.scope, self.eval_globals)
+        if site.native is not None:
+            try:
+                return site.native(*args)
+            except SCRIPT_ERRORS as e:
+                raise RagarRuntimeError(f"{site.function.name}() failed: {error_text(e)}") from e
+        return self.apply(site.function, *args)
+
+    def apply(self, function, *args):
+        """Calls a func, going through its memo table when it is pure."""
+        if function.memo is not None and all(type(arg) in HASHABLE_TYPES for arg in args):
+            return function.memo(*args)
+        return self.invoke(function, *args)
+
+    def invoke(self, function, *args):
+        """Runs a func body in a pooled frame and returns its result."""
+        frame = function.acquire_frame()
+        frame.slots[:function.arity] = args
+        return_pos = self.parser.pos
+        caller_scope = self.scope
+        self.scope = frame
+        self.parser.jump(function.body_pos)
+        try:
+            self.execute_block()
+            return None
+        except ReturnSignal as signal:
+            return signal.value
+        finally:
+            self.parser.jump(return_pos)
+            self.scope = caller_scope
+            if self.budget is not None:
+                self.budget.release_values([(id(frame), name) for name in function.slot_names])
+            function.release_frame(frame)
+
+    def execute_call(self):
+        """Executes a 'name(args);' statement."""
+        site = self.call_sites.get(self.parser.pos)
+        if site is not None:
+            self.parser.jump(site.end)  # Direct call: no re-parsing or lookup
+        else:
+            site = self.bind(self.parser.parse_call())
+        self.parser.require_semicolon()
+        self.call_site(site)
+
+    def execute_return(self):
+        if self.scope is self.variables:
+            raise SyntaxError("'return' outside func")
+        pos = self.parser.pos
+        expression = self.parser.parse_return()
+        if not expression:
+            raise ReturnSignal(None)
+        code = self.returns.get(pos)
+        if code is None:
+            code = self.returns[pos] = compile_expression(condition_source(expression), "<return>")
+        if self.lazy_names:
+            self.materialize(code.co_names)
+        raise ReturnSignal(eval(code, self.eval_globals, self.scope))
@@ -1,39 +1,47 @@
-import re
-from enum import Enum, auto
-
 __all__ = ["TokenType"]
 
-class TokenType(Enum):
-    KEYWORD = auto()      # for commands like 'var', 'put', 'if'
-    IDENTIFIER = auto()   # for variable names
-    NUMBER = auto()       # for integer values
-    FLOAT = auto()        # for decimal numbers
-    STRING = auto()       # for text
-    BOOL = auto()         # for true/false
-    LIST = auto()         # for lists
-    DICT = auto()         # for key-value pairs
-    TYPE = auto()         # NEW: For 'int', 'float', 'string', etc.
-    OPERATOR = auto()     # for '=', '+', '-', '*', '/'
-    SYMBOL = auto()       # for '{', '}', '(', ')', etc.
-    EOF = auto()          # end of file
+class TokenType:
+    # Plain string constants rather than an Enum: importing enum (and re)
+    # costs more than lexing a typical script
+    KEYWORD = "KEYWORD"        # for commands like 'var', 'put', 'if'
+    IDENTIFIER = "IDENTIFIER"  # for variable names
+    NUMBER = "NUMBER"          # for integer values
+    FLOAT = "FLOAT"            # for decimal numbers
+    STRING = "STRING"          # for text
+    BOOL = "BOOL"              # for true/false
+    LIST = "LIST"              # for lists
+    DICT = "DICT"              # for key-value pairs
+    TYPE = "TYPE"              # NEW: For 'int', 'float', 'string', etc.
+    OPERATOR = "OPERATOR"      # for '=', '+', '-', '*', '/'
+    SYMBOL = "SYMBOL"          # for '{', '}', '(', ')', etc.
+    EOF = "EOF"                # end of file
 
-KEYWORDS = {"var", "if", "import", "put"}
+KEYWORDS = {"var", "if", "elif", "else", "import", "put", "ask", "func", "pure", "return"}
 OPERATORS = {"=", "+", "-", "*", "/", ">", "<"}
-SYMBOLS = {";", "(", ")", "{", "}"}
+SYMBOLS = {";", ",", ":", "(", ")", "{", "}", "[", "]"}
 TYPES = {"int", "float", "string", "bool", "list", "dict"}
+DELIMITERS = {"{": "}", "(": ")", "[": "]"}  # Opening symbol -> closing symbol
+CLOSERS = {close: open_ for open_, close in DELIMITERS.items()}
 
-TOKEN_REGEX = [
-    (TokenType.KEYWORD, r'\b(?:var|if|import|put)\b'),  # Only commands
-    (TokenType.TYPE, r'\b(?:int|float|string|bool|list|dict)\b'),  # Types
-    (TokenType.BOOL, r'\b(?:true|false)\b'),
-    (TokenType.FLOAT, r'\b\d+\.\d+\b'),
-    (TokenType.NUMBER, r'\b\d+\b'),
-    (TokenType.STRING, r'"[^"]*"'),
-    (TokenType.OPERATOR, r'[=+\-*/><]'),
-    (TokenType.SYMBOL, r'[;(){}[\]]'),  
-]
+# Scanner tables, built once at import
+WORD_TYPES = {
+    **dict.fromkeys(KEYWORDS, TokenType.KEYWORD),
+    **dict.fromkeys(TYPES, TokenType.TYPE),
+    "true": TokenType.BOOL,
+    "false": TokenType.BOOL,
+}
+SINGLE_CHAR_TYPES = {
+    **dict.fromkeys(OPERATORS, TokenType.OPERATOR),
+    **dict.fromkeys(SYMBOLS, TokenType.SYMBOL),
+}
+DIGITS = frozenset("0123456789")
+LAZY_THRESHOLD = 64 * 1024  # Literals longer than this (in characters) are decoded on first use
+WORD_START = frozenset("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ_")
+WORD_CHARS = WORD_START | DIGITS
 
 class Token:
+    __slots__ = ("type", "value")
+
     def __init__(self, type_, value):
         self.type = type_
         self.value = value
@@ -41,29 +49,135 @@ class Token:
     def __repr__(self):
         return f"Token({self.type}, {self.value})"
 
+def match_delimiter(tokens, index, stack, matches):
+    """Pairs the symbol at `index` with its opening delimiter, if it is one."""
+    value = tokens[index].value
+    if value in DELIMITERS:
+        stack.append(index)
+    elif value in CLOSERS:
+        if not stack or tokens[stack[-1]].value != CLOSERS[value]:
+            raise SyntaxError(f"Unmatched '{value}'")
+        matches[stack.pop()] = index
+
+def check_unclosed(tokens, stack):
+    """Raises if any opening delimiter was never closed."""
+    if stack:
+        raise SyntaxError(f"Unclosed '{tokens[stack[-1]].value}'")
+
+def build_match_table(tokens):
+    """Maps the index of every '{', '(' and '[' token to its closing token."""
+    stack = []
+    matches = {}
+    for index, token in enumerate(tokens):
+        if token.type == TokenType.SYMBOL:
+            match_delimiter(tokens, index, stack, matches)
+    check_unclosed(tokens, stack)
+    return matches
+
+def flat_list_end(code, pos):
+    """Index just past the ']' closing a flat list literal at `pos`, or -1 if it nests."""
+    close = code.find("]", pos)
+    if close == -1:
+        return -1
+    if "[" not in code[pos + 1:close]:
+        if '"' not in code[pos + 1:close]:
+            return close + 1  # Common case: numbers only
+    # Strings may hide brackets; walk them one by one
+    index = pos + 1
+    while index < len(code):
+        char = code[index]
+        if char == '"':
+            index = code.find('"', index + 1)
+            if index == -1:
+                return -1
+        elif char == "[":
+            return -1
+        elif char == "]":
+            return index + 1
+        index += 1
+    return -1
+
+def large_dict_end(code, pos):
+    """Index just past the '}' closing the dict literal at `pos` if the
+    literal is longer than LAZY_THRESHOLD characters, otherwise -1."""
+    depth = 0
+    index = pos
+    while index < len(code):
+        char = code[index]
+        if char == '"':
+            index = code.find('"', index + 1)
+            if index == -1:
+                return -1
+        elif char in "{[":
+            depth += 1
+        elif char in "}]":
+            depth -= 1
+            if depth == 0:
+                return index + 1 if index + 1 - pos > LAZY_THRESHOLD else -1
+        elif char == ";":
+            return -1  # Not a closed literal; lexed token by token, which reports where
+        index += 1
+    return -1
+
+def after_assignment(tokens):
+    """True if the last token is a lone '=' (not part of '==', '<=' or '>=')."""
+    return (len(tokens) > 1 and tokens[-1].value == "=" and tokens[-1].type == TokenType.OPERATOR
+            and tokens[-2].type != TokenType.OPERATOR)
+
 class Lexer:
     def __init__(self, code):
         self.code = code
         self.tokens = []
+        self.matches = {}  # Filled by tokenize(), see build_match_table()
         self.pos = 0
 
     def tokenize(self):
-        while self.pos < len(self.code):
-            match = None
-            for token_type, regex in TOKEN_REGEX:
-                regex = re.compile(regex)
-                match = regex.match(self.code, self.pos)
-                if match:
-                    value = match.group(0)
-                    if token_type == TokenType.STRING:
-                        value = value.strip('"')  # Remove quotes from strings
-                    self.tokens.append(Token(token_type, value))
-                    self.pos = match.end()
-                    break
-            if not match:
-                if self.code[self.pos].isspace():
-                    self.pos += 1  # Skip whitespace
-                else:
-                    raise SyntaxError(f"Unexpected character: {self.code[self.pos]}")
-        self.tokens.append(Token(TokenType.EOF, "EOF"))
-        return self.tokens
+        code = self.code
+        length = len(code)
+        tokens = self.tokens
+        stack = []
+        pos = self.pos
+        while pos < length:
+            char = code[pos]
+            if char in WORD_START:
+                end = pos + 1
+                while end < length and code[end] in WORD_CHARS:
+                    end += 1
+                word = code[pos:end]
+                tokens.append(Token(WORD_TYPES.get(word, TokenType.IDENTIFIER), word))
+            elif char in DIGITS:
+                end = pos + 1
+                while end < length and code[end] in DIGITS:
+                    end += 1
+                token_type = TokenType.NUMBER
+                if end + 1 < length and code[end] == "." and code[end + 1] in DIGITS:
+                    end += 2
+                    while end < length and code[end] in DIGITS:
+                        end += 1
+                    token_type = TokenType.FLOAT
+                tokens.append(Token(token_type, code[pos:end]))
+            elif char == '"':
+                end = code.find('"', pos + 1)
+                if end == -1:
+                    raise SyntaxError("Unterminated string")
+                end += 1
+                tokens.append(Token(TokenType.STRING, code[pos + 1:end - 1]))  # Remove quotes from strings
+            elif char == "[" and (end := flat_list_end(code, pos)) != -1:
+                tokens.append(Token(TokenType.LIST, code[pos:end]))  # Flat list literal, kept as one span
+            elif char == "{" and after_assignment(tokens) and (end := large_dict_end(code, pos)) != -1:
+                tokens.append(Token(TokenType.DICT, code[pos:end]))  # Large dict literal, lexed on first use
+            elif char in SINGLE_CHAR_TYPES:
+                end = pos + 1
+                token_type = SINGLE_CHAR_TYPES[char]
+                tokens.append(Token(token_type, char))
+                if token_type == TokenType.SYMBOL:
+                    match_delimiter(tokens, len(tokens) - 1, stack, self.matches)
+            elif char.isspace():
+                end = pos + 1  # Skip whitespace
+            else:
+                raise SyntaxError(f"Unexpected character: {char}")
+            pos = end
+        self.pos = pos
+        check_unclosed(tokens, stack)
+        tokens.append(Token(TokenType.EOF, "EOF"))
+        return tokens
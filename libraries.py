@@ -0,0 +1,124 @@
+from array import array
+
+from literals import format_value
+
+# RAGAR type name -> accepted Python types ("any" accepts everything)
+TYPE_CHECKS = {
+    "int": (int,),
+    "float": (int, float),
+    "string": (str,),
+    "bool": (bool,),
+    "list": (list, array),
+    "dict": (dict,),
+}
+
+class NativeFunction:
+    """A built-in implemented in Python, with a declared arity and types."""
+
+    __slots__ = ("name", "fn", "arity", "arg_types", "returns", "context")
+
+    def __init__(self, name, fn, arg_types, returns=None, context=False):
+        self.name = name
+        self.fn = fn
+        self.arg_types = arg_types
+        self.arity = len(arg_types)
+        self.returns = returns  # RAGAR type name, or None if it varies
+        self.context = context  # Receives the interpreter as its first argument
+
+    def bind(self, interpreter):
+        """The callable a call site invokes directly."""
+        if self.context:
+            fn = self.fn
+            return lambda *args: fn(interpreter, *args)
+        return self.fn
+
+    def check_args(self, args):
+        for arg_type, arg in zip(self.arg_types, args):
+            accepted = TYPE_CHECKS.get(arg_type)
+            if accepted is not None and not isinstance(arg, accepted):
+                raise TypeError(f"{self.name}() expects {arg_type} but got {format_value(arg)}")
+
+def type_checked(native, fn):
+    """Wraps a bound native so its arguments are checked on every call."""
+    def call(*args):
+        native.check_args(args)
+        return fn(*args)
+    return call
+
+class Library:
+    """A named set of native functions that 'import {name};' makes callable."""
+
+    def __init__(self, name):
+        self.name = name
+        self.functions = {}
+
+    def register(self, *arg_types, name=None, returns=None, context=False):
+        """Decorator registering a Python callable as a native function.
+
+            @std_out.register("any", name="print", context=True)
+            def print_line(interpreter, value): ...
+        """
+        def decorator(fn):
+            native_name = name or fn.__name__
+            self.functions[native_name] = NativeFunction(native_name, fn, arg_types, returns, context)
+            return fn
+        return decorator
+
+LIBRARIES = {}
+
+def library(name):
+    """Returns the library called `name`, creating and registering it if needed."""
+    if name not in LIBRARIES:
+        LIBRARIES[name] = Library(name)
+    return LIBRARIES[name]
+
+def type_name(value):
+    """RAGAR type name of a Python value."""
+    if isinstance(value, bool):
+        return "bool"
+    if isinstance(value, int):
+        return "int"
+    if isinstance(value, float):
+        return "float"
+    if isinstance(value, str):
+        return "string"
+    if isinstance(value, (list, array)):
+        return "list"
+    if isinstance(value, dict):
+        return "dict"
+    return "unknown"
+
+built_in = library("_built_in")
+built_in.register("any", name="len", returns="int")(len)
+built_in.register("any", name="str", returns="string")(format_value)
+built_in.register("any", name="int", returns="int")(int)
+built_in.register("any", name="float", returns="float")(float)
+built_in.register("float", name="abs")(abs)
+built_in.register("float", name="round", returns="int")(round)
+
+std_out = library("_std_out")
+
+@std_out.register("any", name="print", context=True)
+def print_line(interpreter, value):
+    interpreter.emit(format_value(value))
+
+std_in = library("_std_in")
+
+@std_in.register(name="read_line", returns="string", context=True)
+def read_line(interpreter):
+    return interpreter.read_input()
+
+obj = library("_object")
+obj.register("any", name="type_of", returns="string")(type_name)
+
+@obj.register("dict", returns="list")
+def keys(mapping):
+    return list(mapping)
+
+@obj.register("dict", "any", returns="bool")
+def has(mapping, key):
+    return key in mapping
+
+@obj.register("dict", "any")
+def get(mapping, key):
+    return mapping[key]
@@ -0,0 +1,108 @@
+import sys
+import time
+
+from error_handler import (
+    StatementLimitExceeded,
+    DeadlineExceeded,
+    OutputLimitExceeded,
+    ValueSizeLimitExceeded,
+)
+
+class ExecutionLimits:
+    """Per-run resource limits; None disables a limit.
+
+    Statement count and deadline are only checked once every
+    `check_interval` statements, so the interpreter loop pays a single
+    counter decrement per statement.
+    """
+
+    def __init__(self, max_statements=None, timeout=None, max_output_bytes=None,
+                 max_value_bytes=None, check_interval=1024):
+        if check_interval < 1:
+            raise ValueError("check_interval must be at least 1")
+        self.max_statements = max_statements
+        self.timeout = timeout  # Seconds of wall-clock time
+        self.max_output_bytes = max_output_bytes
+        self.max_value_bytes = max_value_bytes
+        self.check_interval = check_interval
+
+def value_size(value):
+    """Approximate memory footprint of a stored value in bytes."""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        for key, item in value.items():
+            size += sys.getsizeof(key) + sys.getsizeof(item)
+    elif isinstance(value, list):
+        for item in value:
+            size += sys.getsizeof(item)
+    return size
+
+class Budget:
+    """Tracks what one run has consumed against its ExecutionLimits."""
+
+    def __init__(self, limits):
+        self.limits = limits
+        self.deadline = None if limits.timeout is None else time.monotonic() + limits.timeout
+        self.statements = 0  # Statements accounted for by finished windows
+        self.window = 0      # Size of the window currently being counted down
+        self.output_bytes = 0
+        self.value_bytes = 0
+        self.value_sizes = {}
+
+    def refill(self):
+        """Closes the current statement window and returns the size of the next one."""
+        limits = self.limits
+        self.statements += self.window
+
+        if limits.max_statements is not None and self.statements >= limits.max_statements:
+            raise StatementLimitExceeded(
+                f"Statement limit of {limits.max_statements} exceeded",
+                limits.max_statements, self.statements + 1)
+
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            raise self.deadline_exceeded()
+
+        window = limits.check_interval
+        if limits.max_statements is not None:
+            window = min(window, limits.max_statements - self.statements)
+        self.window = window
+        return window
+
+    def remaining(self):
+        """Seconds left before the deadline, or None without one."""
+        if self.deadline is None:
+            return None
+        return max(self.deadline - time.monotonic(), 0)
+
+    def deadline_exceeded(self):
+        return DeadlineExceeded(f"Deadline of {self.limits.timeout}s exceeded", self.limits.timeout)
+
+    def charge_output(self, text):
+        """Accounts for one line of output (including its newline)."""
+        self.output_bytes += len(text.encode("utf-8")) + 1
+        limit = self.limits.max_output_bytes
+        if limit is not None and self.output_bytes > limit:
+            raise OutputLimitExceeded(
+                f"Output limit of {limit} bytes exceeded", limit, self.output_bytes)
+
+    def check_value_size(self, size):
+        """Raises if a value of `size` bytes would not fit in what is left."""
+        limit = self.limits.max_value_bytes
+        if limit is not None and self.value_bytes + size > limit:
+            raise ValueSizeLimitExceeded(
+                f"Stored values exceed {limit} bytes", limit, self.value_bytes + size)
+
+    def release_values(self, names):
+        """Stops accounting for variables that no longer exist."""
+        for name in names:
+            self.value_bytes -= self.value_sizes.pop(name, 0)
+
+    def charge_value(self, name, value):
+        """Accounts for storing `value` in variable `name`, replacing its old value."""
+        size = value_size(value)
+        self.value_bytes += size - self.value_sizes.get(name, 0)
+        self.value_sizes[name] = size
+        limit = self.limits.max_value_bytes
+        if limit is not None and self.value_bytes > limit:
+            raise ValueSizeLimitExceeded(
+                f"Stored values exceed {limit} bytes", limit, self.value_bytes)
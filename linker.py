@@ -0,0 +1,253 @@
+"""Whole-program linking for scripts that 'import {module};' other .rgr files.
+
+The linker splices every imported module into the entry script at its
+first import, then keeps only the declarations reachable from the
+program's statements. The pruned token stream is written to
+__ragarcache__/ next to the entry script and reused while none of its
+source files change, and while no module file appears at a path an
+import was looked up at.
+"""
+import marshal
+import os
+from time import perf_counter
+
+from lexer import Lexer, Token, TokenType, build_match_table
+from parser import Parser
+
+CACHE_DIR = "__ragarcache__"
+IMAGE_FORMAT = 2  # Bump when the image layout changes
+
+class Statement:
+    """One top-level statement of a module, as a token range."""
+
+    __slots__ = ("module", "start", "end", "kind", "name", "uses", "root")
+
+    def __init__(self, module, start, end, kind, name=None, uses=(), root=True):
+        self.module = module
+        self.start = start
+        self.end = end    # Index just past the statement
+        self.kind = kind  # Leading keyword, or "call"
+        self.name = name  # Name a droppable declaration defines
+        self.uses = uses  # Identifiers the statement refers to
+        self.root = root  # Kept whether or not anything refers to it
+
+class LinkReport:
+    """What a link kept and dropped, and what loading the result costs."""
+
+    def __init__(self, modules, dropped, tokens_total, tokens_kept, source_ms):
+        self.modules = modules            # Linked .rgr files, entry first
+        self.dropped = dropped            # (module, kind, name) of each pruned declaration
+        self.tokens_total = tokens_total
+        self.tokens_kept = tokens_kept
+        self.source_ms = source_ms        # Lexing and linking every module from source
+        self.image_ms = None              # Loading the cached image, once measured
+
+    def format(self):
+        lines = [f"linked {len(self.modules)} module(s): " + ", ".join(self.modules)]
+        for module, kind, name in self.dropped:
+            lines.append(f"  dropped {kind} {name} ({module})")
+        dropped = self.tokens_total - self.tokens_kept
+        percent = 100 * dropped / self.tokens_total if self.tokens_total else 0
+        lines.append(f"tokens: kept {self.tokens_kept} of {self.tokens_total} ({percent:.0f}% dropped)")
+        lines.append(f"load from source: {self.source_ms:8.3f} ms")
+        if self.image_ms is not None:
+            lines.append(f"load from image:  {self.image_ms:8.3f} ms "
+                         f"(saves {self.source_ms - self.image_ms:.3f} ms)")
+        return "\n".join(lines)
+
+class ProgramImage:
+    """A linked token stream, ready for Parser(image.tokens, image.matches)."""
+
+    def __init__(self, tokens, matches, report, sources, probed=()):
+        self.tokens = tokens
+        self.matches = matches
+        self.report = report
+        self.sources = sources  # Path -> (mtime_ns, size) of every linked file
+        self.probed = probed    # Paths an import looked for and did not find
+
+def identifiers(tokens, start, end, exclude=()):
+    return {token.value for token in tokens[start:end]
+            if token.type == TokenType.IDENTIFIER and token.value not in exclude}
+
+class Linker:
+    def __init__(self, entry_path, search_path=None, prune=True):
+        self.entry_path = entry_path
+        # Directories searched after the importing module's own
+        self.search_path = search_path if search_path is not None else [os.path.dirname(os.path.abspath(entry_path))]
+        self.prune = prune
+        self.tokens = {}      # Module path -> tokens
+        self.sources = {}     # Module path -> (mtime_ns, size)
+        self.probed = set()   # Missing paths tried before an import resolved
+        self.statements = []  # Every top-level statement, in run order
+        self.natives = None   # libraries.LIBRARIES, imported by the first 'import'
+        self.setup_ms = 0.0
+
+    def native_library(self, name):
+        """True if `name` is a built-in library rather than an .rgr module."""
+        if self.natives is None:
+            started = perf_counter()
+            from libraries import LIBRARIES
+            self.natives = LIBRARIES
+            # The interpreter pays for this import with or without the image
+            self.setup_ms = (perf_counter() - started) * 1000
+        return name in self.natives
+
+    def resolve(self, name, importer):
+        """Path of the .rgr module `name` imported from `importer`."""
+        for directory in [os.path.dirname(importer), *self.search_path]:
+            path = os.path.abspath(os.path.join(directory, name + ".rgr"))
+            if os.path.isfile(path):
+                return path
+            self.probed.add(path)  # A file created here later would change the link
+        raise SyntaxError(f"{importer}: Module not found: {name}")
+
+    def load_module(self, path):
+        with open(path, 'r') as file:
+            stat = os.fstat(file.fileno())
+            source_code = file.read()
+        lexer = Lexer(source_code)
+        try:
+            tokens = lexer.tokenize()
+        except SyntaxError as e:
+            raise SyntaxError(f"{path}: {e}")
+        self.tokens[path] = tokens
+        self.sources[path] = (stat.st_mtime_ns, stat.st_size)
+        return tokens, lexer.matches
+
+    def add_module(self, path):
+        """Appends the statements of `path`, splicing in its imports where they occur."""
+        tokens, matches = self.load_module(path)
+        parser = Parser(tokens, matches)
+        while parser.current_token.type != TokenType.EOF:
+            start = parser.pos
+            token = parser.current_token
+            keyword = token.value if token.type == TokenType.KEYWORD else None
+            try:
+                if keyword == "import":
+                    name = parser.parse_import()
+                elif keyword in ("func", "pure"):
+                    name, params, body_pos, pure = parser.parse_function_declaration()
+                else:
+                    parser.skip_statement()
+            except SyntaxError as e:
+                raise SyntaxError(f"{path}: {e}")
+
+            if keyword == "import":
+                if self.native_library(name):
+                    self.statements.append(Statement(path, start, parser.pos, "import"))
+                    continue
+                module = self.resolve(name, path)
+                if module not in self.tokens:
+                    self.add_module(module)  # Already linked modules are not run twice
+            elif keyword in ("func", "pure"):
+                uses = identifiers(tokens, body_pos, parser.pos, params)
+                kind = "pure func" if pure else "func"
+                self.statements.append(Statement(path, start, parser.pos, kind, name, uses, False))
+            elif keyword == "var":
+                name = tokens[start + 1].value
+                uses = identifiers(tokens, start + 2, parser.pos)
+                # A literal value has no side effects, so an unused one can go;
+                # a call in the value has to run either way
+                self.statements.append(Statement(path, start, parser.pos, "var", name, uses, bool(uses)))
+            else:
+                uses = identifiers(tokens, start, parser.pos)
+                self.statements.append(Statement(path, start, parser.pos, keyword or "call", None, uses))
+
+    def reachable(self):
+        """Statements to keep: every root, and each declaration a kept statement uses."""
+        if not self.prune:
+            return self.statements
+        definitions = {}
+        for statement in self.statements:
+            if not statement.root:
+                definitions.setdefault(statement.name, []).append(statement)
+        live = set()
+        pending = [name for statement in self.statements if statement.root for name in statement.uses]
+        while pending:
+            name = pending.pop()
+            if name in live:
+                continue
+            live.add(name)
+            for statement in definitions.get(name, ()):
+                pending.extend(statement.uses)
+        return [statement for statement in self.statements if statement.root or statement.name in live]
+
+    def link(self):
+        """Links the program from source and returns its ProgramImage."""
+        started = perf_counter()
+        self.add_module(os.path.abspath(self.entry_path))
+        kept = self.reachable()
+        image = []
+        for statement in kept:
+            image.extend(self.tokens[statement.module][statement.start:statement.end])
+        image.append(Token(TokenType.EOF, "EOF"))
+        matches = build_match_table(image)
+
+        kept_ids = set(map(id, kept))
+        dropped = [(os.path.basename(statement.module), statement.kind, statement.name)
+                   for statement in self.statements if id(statement) not in kept_ids]
+        total = sum(len(tokens) - 1 for tokens in self.tokens.values()) + 1  # One EOF in the image
+        report = LinkReport([os.path.basename(path) for path in self.tokens], dropped,
+                            total, len(image), (perf_counter() - started) * 1000 - self.setup_ms)
+        return ProgramImage(image, matches, report, self.sources, sorted(self.probed))
+
+def cache_path(entry_path):
+    directory, name = os.path.split(os.path.abspath(entry_path))
+    return os.path.join(directory, CACHE_DIR, os.path.splitext(name)[0] + ".img")
+
+def write_image(path, image):
+    """Writes `image` to `path`; a cache that cannot be written is skipped."""
+    report = image.report
+    data = (IMAGE_FORMAT, image.sources, list(image.probed),
+            [(token.type, token.value) for token in image.tokens],
+            report.modules, report.dropped, report.tokens_total, report.source_ms)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, 'wb') as file:
+            marshal.dump(data, file)
+        os.replace(temporary, path)  # Readers never see a partial image
+    except OSError:
+        pass
+
+def read_image(path):
+    """The cached ProgramImage at `path`, or None if it is missing or stale."""
+    started = perf_counter()
+    try:
+        with open(path, 'rb') as file:
+            data = marshal.load(file)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    if not isinstance(data, tuple) or len(data) != 8 or data[0] != IMAGE_FORMAT:
+        return None
+    _, sources, probed, pairs, modules, dropped, tokens_total, source_ms = data
+    for source, stamp in sources.items():
+        try:
+            stat = os.stat(source)
+        except OSError:
+            return None
+        if (stat.st_mtime_ns, stat.st_size) != stamp:
+            return None
+    if any(os.path.exists(missing) for missing in probed):
+        return None  # A new module would now shadow one that was linked
+    tokens = [Token(token_type, value) for token_type, value in pairs]
+    report = LinkReport(modules, [tuple(entry) for entry in dropped], tokens_total, len(tokens), source_ms)
+    image = ProgramImage(tokens, build_match_table(tokens), report, sources, probed)
+    report.image_ms = (perf_counter() - started) * 1000
+    return image
+
+def load_program(entry_path, prune=True, cache=True):
+    """The linked ProgramImage for `entry_path`, from the cache when it is fresh.
+
+    Only programs that import other .rgr modules are cached; a lone script
+    lexes about as fast as its image would load.
+    """
+    path = cache_path(entry_path)
+    if cache and prune:
+        image = read_image(path)
+        if image is not None:
+            return image
+    image = Linker(entry_path, prune=prune).link()
+    if cache and prune and len(image.sources) > 1:
+        write_image(path, image)
+    return image
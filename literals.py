@@ -0,0 +1,200 @@
+from lexer import LAZY_THRESHOLD, Lexer, TokenType
+
+# RAGAR type name -> Python types a value of that type may have
+VALUE_TYPES = {
+    "int": (int,),
+    "float": (int, float),
+    "string": (str,),
+    "bool": (bool,),
+    "list": (list,),
+    "dict": (dict,),
+}
+
+_SCALAR = r'\s*(?:"[^"]*"|true|false|[-+]?\d+(?:\.\d+)?)\s*'
+# Characters a flat numeric list can contain; anything else (letters,
+# quotes, '_') rules out the int()/float() fast path, which would accept
+# 'inf', '1e5' or '1_000'
+NUMERIC_CHARS = frozenset("0123456789+-., \t\r\n[]")
+_patterns = None
+array = None       # array.array, imported by the first list literal that needs it
+PackedList = None  # packed.PackedList, imported along with it
+
+def list_patterns():
+    """(SCALAR_LIST, SCALAR), compiled on first use so scripts with only
+    numeric list literals never import re."""
+    global _patterns
+    if _patterns is None:
+        import re
+        _patterns = (
+            re.compile(rf'\[(?:{_SCALAR}(?:,{_SCALAR})*,?)?\s*\]'),
+            re.compile(r'"([^"]*)"|(true|false)|([-+]?\d+\.\d+)|([-+]?\d+)'),
+        )
+    return _patterns
+
+class LazyLiteral:
+    """A large literal kept as its source span until it is first used."""
+
+    __slots__ = ("decoder", "span", "value")
+
+    def __init__(self, decoder, span):
+        self.decoder = decoder
+        self.span = span  # Source text
+        self.value = None
+
+    def decode(self):
+        if self.value is None:
+            self.value = self.decoder(self.span)
+            self.span = None  # Release the source once decoded
+        return self.value
+
+    def __sizeof__(self):
+        if self.span is None:
+            return object.__sizeof__(self)
+        return object.__sizeof__(self) + len(self.span)
+
+def literal_value(token):
+    """Converts a literal token to its Python value."""
+    if token.type == TokenType.NUMBER:
+        return int(token.value)
+    if token.type == TokenType.FLOAT:
+        return float(token.value)
+    if token.type == TokenType.STRING:
+        return token.value
+    if token.type == TokenType.BOOL:
+        return token.value == "true"
+    raise SyntaxError(f"Expected a literal but got {token}")
+
+def _numbers(text):
+    """The comma-separated items of a flat numeric list literal."""
+    body = text[1:-1].strip()
+    if body.endswith(","):
+        body = body[:-1]
+    return body.split(",") if body else []
+
+def _float(item):
+    """float(item) for an item the scalar pattern reads as a float ('1.5', not '1' or '1.')."""
+    whole, dot, fraction = item.strip().partition(".")
+    if not (dot and fraction.isdigit() and whole.lstrip("+-")[-1:].isdigit()):
+        raise ValueError(item)
+    return float(whole + dot + fraction)
+
+def packed(typecode, values):
+    """PackedList(typecode, values), importing array on first use."""
+    global array, PackedList
+    if array is None:
+        from packed import array, PackedList
+    return PackedList(typecode, values)
+
+def decode_list(text):
+    """Decodes a flat '[...]' literal.
+
+    All-int and all-float lists are packed straight into a PackedList
+    (array('q') / array('d')) instead of a list of Python objects; mixed
+    lists stay plain lists.
+    """
+    if NUMERIC_CHARS.issuperset(text):
+        items = _numbers(text)
+        try:
+            return packed("q", map(int, items))
+        except OverflowError:
+            return list(map(int, items))  # Wider than 64 bits
+        except ValueError:
+            pass  # Not all ints
+        try:
+            return packed("d", map(_float, items))
+        except ValueError:
+            pass  # Mixed or malformed; the scalar pattern decides
+
+    scalar_list, scalar = list_patterns()
+    if not scalar_list.fullmatch(text):
+        raise SyntaxError(f"Invalid list literal: {text[:40]}")
+    values = []
+    for string, boolean, number_f, number_i in scalar.findall(text):
+        if boolean:
+            values.append(boolean == "true")
+        elif number_f:
+            values.append(float(number_f))
+        elif number_i:
+            values.append(int(number_i))
+        else:
+            values.append(string)
+    return values
+
+def list_literal(text):
+    """Decodes a LIST token now, or defers it if it is large."""
+    if len(text) > LAZY_THRESHOLD:
+        return LazyLiteral(decode_list, text)
+    return decode_list(text)
+
+def decode_value(tokens, matches, pos):
+    """Decodes the literal value starting at `pos`; returns (value, next pos)."""
+    token = tokens[pos]
+    if token.type == TokenType.LIST:
+        return decode_list(token.value), pos + 1
+    if token.type == TokenType.SYMBOL and token.value == "[":
+        return decode_nested_list((tokens, pos, matches[pos]), matches), matches[pos] + 1
+    if token.type == TokenType.SYMBOL and token.value == "{":
+        return decode_dict((tokens, pos, matches[pos]), matches), matches[pos] + 1
+    return literal_value(token), pos + 1
+
+def decode_nested_list(span, matches):
+    """Decodes a '[...]' literal whose items are themselves lists or dicts."""
+    tokens, pos, end = span
+    values = []
+    pos += 1
+    while pos < end:
+        value, pos = decode_value(tokens, matches, pos)
+        values.append(value)
+        if pos < end:
+            if tokens[pos].value != ",":
+                raise SyntaxError(f"Expected ',' in list but got {tokens[pos]}")
+            pos += 1
+    return values
+
+def decode_dict(span, matches):
+    """Decodes a '{key: value, ...}' literal in one pass over its tokens."""
+    tokens, pos, end = span
+    keys = []
+    values = []
+    pos += 1
+    while pos < end:
+        key = tokens[pos]
+        if key.type not in (TokenType.STRING, TokenType.NUMBER) or tokens[pos + 1].value != ":":
+            raise SyntaxError(f"Invalid dict entry at {key}")
+        keys.append(key.value if key.type == TokenType.STRING else int(key.value))
+        value, pos = decode_value(tokens, matches, pos + 2)
+        values.append(value)
+        if pos < end:
+            if tokens[pos].value != ",":
+                raise SyntaxError(f"Expected ',' in dict but got {tokens[pos]}")
+            pos += 1
+    return dict(zip(keys, values))
+
+def decode_dict_source(text):
+    """Lexes and decodes a DICT token's '{...}' source."""
+    lexer = Lexer(text)
+    tokens = lexer.tokenize()
+    end = len(tokens) - 2  # Index of the closing '}', before EOF
+    if lexer.matches.get(0) != end:
+        raise SyntaxError(f"Invalid dict literal: {text[:40]}")
+    return decode_dict((tokens, 0, end), lexer.matches)
+
+def dict_literal(token):
+    """Defers a DICT token, which the lexer only makes for large literals."""
+    return LazyLiteral(decode_dict_source, token.value)
+
+def is_type(value, type_name):
+    """True if `value` may be stored in a variable declared as `type_name`."""
+    if isinstance(value, bool) and type_name != "bool":
+        return False
+    if type_name == "list" and array is not None and isinstance(value, array):
+        return True  # Packed numeric list
+    accepted = VALUE_TYPES.get(type_name)
+    return accepted is None or isinstance(value, accepted)
+
+def format_value(value):
+    """Text 'put' shows for a value.
+
+    PackedList prints as a list, also when nested inside a list or dict.
+    """
+    return str(value)
@@ -0,0 +1,59 @@
+"""Compact storage for numeric list literals, imported by the first one decoded."""
+from array import array
+
+class PackedList(array):
+    """An array('q') or array('d') that compares, concatenates and prints
+    like the RAGAR list it was decoded from."""
+
+    __slots__ = ()
+
+    def __repr__(self):
+        return repr(self.tolist())
+
+    __str__ = __repr__
+
+    def __eq__(self, other):
+        if isinstance(other, (list, array)):
+            return self.tolist() == list(other)
+        return NotImplemented
+
+    def __ne__(self, other):
+        if isinstance(other, (list, array)):
+            return self.tolist() != list(other)
+        return NotImplemented
+
+    def __lt__(self, other):
+        if isinstance(other, (list, array)):
+            return self.tolist() < list(other)
+        return NotImplemented
+
+    def __le__(self, other):
+        if isinstance(other, (list, array)):
+            return self.tolist() <= list(other)
+        return NotImplemented
+
+    def __gt__(self, other):
+        if isinstance(other, (list, array)):
+            return self.tolist() > list(other)
+        return NotImplemented
+
+    def __ge__(self, other):
+        if isinstance(other, (list, array)):
+            return self.tolist() >= list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __add__(self, other):
+        if isinstance(other, array) and other.typecode == self.typecode:
+            result = PackedList(self.typecode, self)
+            result.extend(other)
+            return result
+        if isinstance(other, (list, array)):
+            return self.tolist() + list(other)  # Mixed element types: fall back to a list
+        return NotImplemented
+
+    def __radd__(self, other):
+        if isinstance(other, list):
+            return other + self.tolist()
+        return NotImplemented
@@ -1,8 +1,75 @@
-from lexer import TokenType
+from lexer import TokenType, build_match_table
+from literals import decode_list, list_literal, dict_literal, decode_dict, decode_nested_list
+
+# Tokens that can name a call; 'int(...)' and 'float(...)' start with a TYPE token
+CALL_TOKENS = (TokenType.IDENTIFIER, TokenType.TYPE)
+# Two-character operators lexed as two tokens; any other pair (such as '**')
+# stays two operators and fails to compile
+JOINED_OPERATORS = {"==", "<=", ">="}
+# The only Python built-ins an expression can reach (see type_checker.CONDITION_BUILTINS)
+SAFE_BUILTINS = {"len": len, "abs": abs, "min": min, "max": max, "str": str, "int": int, "float": float}
+REPEAT = "__repeat__"  # Name every compiled '*' calls, so the interpreter can bound its result
+
+def condition_source(tokens):
+    """Builds Python source for a condition from its tokens."""
+    parts = []
+    previous = None
+    for token in tokens:
+        if token.type == TokenType.STRING:
+            part = repr(token.value)  # The lexer strips the quotes
+        elif token.type == TokenType.BOOL:
+            part = "True" if token.value == "true" else "False"
+        elif token.type == TokenType.LIST:
+            part = repr(decode_list(token.value))  # Raw span may hold 'true'/'false'
+        else:
+            part = token.value
+        if (previous is not None and previous.type == TokenType.OPERATOR
+                and token.type == TokenType.OPERATOR and parts[-1] + part in JOINED_OPERATORS):
+            parts[-1] += part
+        else:
+            parts.append(part)
+        previous = token
+    return " ".join(parts)
+
+def compile_expression(source, filename):
+    """Compiles expression source, turning every 'a * b' into '__repeat__(a, b)'.
+
+    A string or list times a count is sized before it is built, so one
+    expression cannot allocate past the run's value limit. Only sources
+    containing '*' pay for importing ast.
+    """
+    if "*" not in source:
+        return compile(source, filename, "eval")
+    import ast
+
+    class Repeat(ast.NodeTransformer):
+        def visit_BinOp(self, node):
+            self.generic_visit(node)
+            if not isinstance(node.op, ast.Mult):
+                return node
+            call = ast.Call(ast.Name(REPEAT, ast.Load()), [node.left, node.right], [])
+            return ast.copy_location(call, node)
+
+    tree = ast.fix_missing_locations(Repeat().visit(ast.parse(source, filename, "eval")))
+    return compile(tree, filename, "eval")
+
+class Call:
+    """A 'name(arg, ...)' call: the function name and the tokens of each argument."""
+
+    def __init__(self, name, args, pos, end):
+        self.name = name
+        self.args = args
+        self.pos = pos  # Index of the name token, identifies the call site
+        self.end = end  # Index just past the closing ')'
+
+    def __repr__(self):
+        return f"Call({self.name}, {self.args})"
 
 class Parser:
-    def __init__(self, tokens):
+    def __init__(self, tokens, matches=None):
         self.tokens = tokens
+        # Opening delimiter index -> closing delimiter index (see Lexer.matches)
+        self.matches = matches if matches is not None else build_match_table(tokens)
         self.current_token = None
         self.pos = -1
         self.next_token()
@@ -12,6 +79,17 @@ class Parser:
         self.pos += 1
         self.current_token = self.tokens[self.pos] if self.pos < len(self.tokens) else None
 
+    def jump(self, pos):
+        """Move directly to token index `pos`."""
+        self.pos = pos
+        self.current_token = self.tokens[pos] if pos < len(self.tokens) else None
+
+    def at(self, value):
+        """True if the current token is the keyword or symbol `value`."""
+        return (self.current_token is not None
+                and self.current_token.value == value
+                and self.current_token.type in (TokenType.KEYWORD, TokenType.SYMBOL))
+
     def eat(self, expected_type):
         """Consume the current token if it matches the expected type."""
         if self.current_token is None:
@@ -32,33 +110,50 @@ class Parser:
 
     def parse(self):
         """Main parse function to process all statements."""
-        while self.current_token is not None:
+        while self.current_token is not None and self.current_token.type != TokenType.EOF:
             self.parse_statement()
 
     def parse_statement(self):
         """Parses a single statement."""
-        print(f"{self.current_token}")  # Debugging line
-
         if self.current_token.value == "import":
             self.parse_import()
         elif self.current_token.value == "var":
             self.parse_variable_declaration()
         elif self.current_token.value == "if":
             self.parse_if_statement()
+            self.parse_block()
+            while self.at("elif"):
+                self.parse_if_statement()
+                self.parse_block()
+            if self.at("else"):
+                self.eat(TokenType.KEYWORD)  # Eat 'else'
+                self.parse_block()
         elif self.current_token.value == "put":
             self.parse_put()
+        elif self.current_token.value == "ask":
+            self.parse_ask()
+        elif self.current_token.value in ("func", "pure"):
+            _, _, body_pos, _ = self.parse_function_declaration()
+            end = self.pos
+            self.jump(body_pos)
+            self.parse_block()
+            self.jump(end)
+        elif self.current_token.value == "return":
+            self.parse_return()
+        elif self.is_call():
+            self.parse_call()
+            self.require_semicolon()
         else:
             raise SyntaxError(f"Unexpected token: {self.current_token}")
 
     def parse_import(self):
         """Handles 'import' statements."""
         self.eat(TokenType.KEYWORD)  # Eat 'import'
-        mod = self.current_token.value  # Get module name
         self.eat(TokenType.SYMBOL) # {
+        mod = self.current_token.value  # Get module name
         self.eat(TokenType.IDENTIFIER)  # Eat module name
         self.eat(TokenType.SYMBOL) # }
         self.require_semicolon()  # Ensure ';' is present
-        print(f"Imported: {mod}")  # Print actual module name
         return mod  # Optionally return the module name for further processing
 
     def parse_variable_declaration(self):
@@ -74,8 +169,11 @@ class Parser:
         self.eat(TokenType.TYPE)  # Eat the type (int, float, etc.)
     
         self.eat(TokenType.OPERATOR)  # Eat '='
+
+        if self.is_call():
+            value = self.parse_call()  # Evaluated by the interpreter
     
-        if var_type == "int":
+        elif var_type == "int":
             value = int(self.current_token.value)
             self.eat(TokenType.NUMBER)
     
@@ -101,28 +199,94 @@ class Parser:
             raise SyntaxError(f"Unknown data type: {var_type}")
     
         self.require_semicolon()
-        self.variables[var_name] = value
-        return var_name, value
+        return var_name, var_type, value
+
+    def parse_list(self):
+        """Parses a list literal: one LIST token, or '[...]' holding nested literals."""
+        if self.current_token.type == TokenType.LIST:
+            value = list_literal(self.current_token.value)
+            self.next_token()
+            return value
+        if not self.at("["):
+            raise SyntaxError(f"Expected a list but got {self.current_token}")
+        end = self.matches[self.pos]
+        value = decode_nested_list((self.tokens, self.pos, end), self.matches)
+        self.jump(end + 1)
+        return value
+
+    def parse_dict(self):
+        """Parses a '{key: value, ...}' literal: '{...}' tokens, or one DICT
+        token the lexer kept as source because it is large."""
+        if self.current_token.type == TokenType.DICT:
+            value = dict_literal(self.current_token)
+            self.next_token()
+            return value
+        if not self.at("{"):
+            raise SyntaxError(f"Expected a dict but got {self.current_token}")
+        value = decode_dict((self.tokens, self.pos, self.matches[self.pos]), self.matches)
+        self.jump(self.matches[self.pos] + 1)
+        return value
 
     def parse_if_statement(self):
         """Handles 'if' statements with proper condition evaluation."""
-        self.eat(TokenType.KEYWORD)  # Eat 'if'
-        self.eat(TokenType.SYMBOL)   # Eat '('
-    
-        # Collect tokens for the condition
-        condition_tokens = []
-        while self.current_token.type != TokenType.SYMBOL or self.current_token.value != ")":
-            condition_tokens.append(self.current_token)
-            self.eat(self.current_token.type)
-    
-        self.eat(TokenType.SYMBOL)   # Eat ')'
-        
-        # Convert condition tokens to a string
-        condition_str = " ".join(token.value for token in condition_tokens)
-        print(f"DEBUG: Parsed Condition: {condition_str}")  # Debugging
-    
+        self.eat(TokenType.KEYWORD)  # Eat 'if' (or 'elif')
+        if not self.at("("):
+            raise SyntaxError(f"Expected '(' but got {self.current_token}")
+
+        # The condition is everything up to the matching ')'
+        close = self.matches[self.pos]
+        condition_tokens = self.tokens[self.pos + 1:close]
+        self.jump(close + 1)  # Skip past ')'
+
         return condition_tokens  # Pass tokens to Interpreter for evaluation
 
+    def parse_block(self):
+        """Parses a '{ ... }' block or a single statement."""
+        if self.at("{"):
+            end = self.matches[self.pos]
+            self.eat(TokenType.SYMBOL)  # Eat '{'
+            while self.pos < end:
+                self.parse_statement()
+            self.eat(TokenType.SYMBOL)  # Eat '}'
+        else:
+            self.parse_statement()
+
+    def skip_block(self):
+        """Skips a '{ ... }' block (one jump) or a single statement."""
+        if self.at("{"):
+            self.jump(self.matches[self.pos] + 1)
+        else:
+            self.skip_statement()
+
+    def skip_statement(self):
+        """Skips one statement without executing it."""
+        if self.at("func") or self.at("pure"):
+            self.parse_function_declaration()  # Jumps past the body
+            return
+        if self.at("if"):
+            self.parse_if_statement()
+            self.skip_block()
+            self.skip_else_chain()
+            return
+        while self.current_token is not None and self.current_token.type != TokenType.EOF:
+            if self.current_token.type == TokenType.SYMBOL and self.pos in self.matches:
+                self.jump(self.matches[self.pos] + 1)
+            elif self.at(";"):
+                self.next_token()
+                return
+            else:
+                self.next_token()
+        raise SyntaxError("Missing semicolon")
+
+    def skip_else_chain(self):
+        """Skips any 'elif'/'else' branches following a taken branch."""
+        while self.at("elif"):
+            self.parse_if_statement()
+            self.skip_block()
+        if self.at("else"):
+            self.eat(TokenType.KEYWORD)  # Eat 'else'
+            self.skip_block()
+
     def parse_put(self):
         """Handles 'put' statements (print)."""
         self.eat(TokenType.KEYWORD)  # Eat 'put'
@@ -148,5 +312,123 @@ class Parser:
             raise SyntaxError("Expected '{' after 'put'")
 
         self.require_semicolon()
-        print(f"{output_value}")  # Debugging output
         return output_value  # Return the variable name (if identifier)
+
+    def parse_ask(self):
+        """Handles 'ask' statements (input) like 'ask {name};'"""
+        self.eat(TokenType.KEYWORD)  # Eat 'ask'
+
+        if self.current_token.type == TokenType.SYMBOL and self.current_token.value == "{":
+            self.eat(TokenType.SYMBOL)  # Eat '{'
+        else:
+            raise SyntaxError("Expected '{' after 'ask'")
+
+        var_name = self.current_token.value
+        self.eat(TokenType.IDENTIFIER)  # Eat target variable name
+
+        if self.current_token.type == TokenType.SYMBOL and self.current_token.value == "}":
+            self.eat(TokenType.SYMBOL)  # Eat '}'
+        else:
+            raise SyntaxError("Expected '}' after ask target")
+
+        self.require_semicolon()
+        return var_name
+
+    def is_call(self):
+        """True if the current token starts a 'name(...)' call."""
+        return (self.current_token.type in CALL_TOKENS
+                and self.tokens[self.pos + 1].type == TokenType.SYMBOL
+                and self.tokens[self.pos + 1].value == "(")
+
+    def parse_arguments(self):
+        """Parses '(a, b + 1, ...)' and returns the token list of each item."""
+        if not self.at("("):
+            raise SyntaxError(f"Expected '(' but got {self.current_token}")
+        close = self.matches[self.pos]
+        self.next_token()  # Skip '('
+        items = []
+        item = []
+        while self.pos < close:
+            if self.at(","):
+                if not item:
+                    raise SyntaxError("Empty argument")
+                items.append(item)
+                item = []
+                self.next_token()
+            elif self.current_token.type == TokenType.SYMBOL and self.pos in self.matches:
+                # Nested parentheses stay inside the current item
+                end = self.matches[self.pos]
+                item.extend(self.tokens[self.pos:end + 1])
+                self.jump(end + 1)
+            else:
+                item.append(self.current_token)
+                self.next_token()
+        if item:
+            items.append(item)
+        elif items:
+            raise SyntaxError("Empty argument")
+        self.jump(close + 1)  # Skip ')'
+        return items
+
+    def parse_call(self):
+        """Parses 'name(arg, ...)' (without the trailing ';')."""
+        pos = self.pos
+        name = self.current_token.value
+        if self.current_token.type not in CALL_TOKENS:
+            raise SyntaxError(f"Expected a func name but got {self.current_token}")
+        self.next_token()  # Eat function name
+        args = self.parse_arguments()
+        return Call(name, args, pos, self.pos)
+
+    def top_level_functions(self):
+        """Token indexes of the '[pure] func' declarations outside any block."""
+        positions = []
+        pos = 0
+        while pos < len(self.tokens):
+            token = self.tokens[pos]
+            if token.type == TokenType.KEYWORD and token.value in ("pure", "func"):
+                positions.append(pos)
+                pos += 1 if token.value == "pure" else 0  # 'pure func' is one declaration
+            elif pos in self.matches:
+                pos = self.matches[pos]  # Skip the block or bracket
+            pos += 1
+        return positions
+
+    def parse_function_declaration(self):
+        """Parses '[pure] func name(a, b) { ... }' and jumps past the body.
+
+        Returns (name, params, body_pos, pure) where body_pos is the index
+        of the body's '{'.
+        """
+        pure = self.at("pure")
+        if pure:
+            self.eat(TokenType.KEYWORD)  # Eat 'pure'
+        if not self.at("func"):
+            raise SyntaxError(f"Expected 'func' but got {self.current_token}")
+        self.eat(TokenType.KEYWORD)  # Eat 'func'
+
+        name = self.current_token.value
+        self.eat(TokenType.IDENTIFIER)  # Eat function name
+
+        params = []
+        for item in self.parse_arguments():
+            if len(item) != 1 or item[0].type != TokenType.IDENTIFIER:
+                raise SyntaxError(f"Invalid parameter: {' '.join(token.value for token in item)}")
+            params.append(item[0].value)
+
+        if not self.at("{"):
+            raise SyntaxError("Expected '{' to open func body")
+        body_pos = self.pos
+        self.jump(self.matches[body_pos] + 1)  # Skip the body
+        return name, params, body_pos, pure
+
+    def parse_return(self):
+        """Parses 'return {expr};' or 'return;' and returns the expression tokens."""
+        self.eat(TokenType.KEYWORD)  # Eat 'return'
+        expression = []
+        if self.at("{"):
+            close = self.matches[self.pos]
+            expression = self.tokens[self.pos + 1:close]
+            self.jump(close + 1)
+        self.require_semicolon()
+        return expression
@@ -0,0 +1,259 @@
+"""RAGAR command line.
+
+    python3 ragar.py run <file.rgr> [--check] [limits]
+    python3 ragar.py check <file.rgr>
+    python3 ragar.py link <file.rgr>
+    python3 ragar.py bench <file.rgr> [-n RUNS]
+    python3 ragar.py bench --startup
+
+Only sys is imported up front; each command imports the parts of the
+interpreter it actually uses, so 'ragar check' never loads the runtime
+and 'ragar run' never loads the type checker unless asked to.
+"""
+import sys
+
+VERSION = "0.1.2"
+STARTUP_BUDGET_MS = 10.0  # Import time 'ragar run' may add on top of bare Python
+# What 'bench --startup' runs: a declaration, a condition and output
+STARTUP_SCRIPT = 'var x int = 1;\nif (x == 1) { put {"ok"}; }\n'
+
+USAGE = """usage: python3 ragar.py [run] <file.rgr> [--check] [--max-statements N] [--timeout S]
+                          [--max-output BYTES] [--max-value BYTES]
+       python3 ragar.py check <file.rgr>
+       python3 ragar.py link <file.rgr>
+       python3 ragar.py bench <file.rgr> [-n RUNS]
+       python3 ragar.py bench --startup
+       python3 ragar.py --version"""
+
+# Option name -> (key, converter); converter None marks a flag
+OPTIONS = {
+    "--check": ("check", None),
+    "--startup": ("startup", None),
+    "-n": ("runs", int),
+    "--max-statements": ("max_statements", int),
+    "--timeout": ("timeout", float),
+    "--max-output": ("max_output_bytes", int),
+    "--max-value": ("max_value_bytes", int),
+}
+LIMIT_KEYS = ("max_statements", "timeout", "max_output_bytes", "max_value_bytes")
+
+class UsageError(Exception):
+    pass
+
+def parse_options(args):
+    """Splits command arguments into (positional, options)."""
+    positional = []
+    options = {}
+    index = 0
+    while index < len(args):
+        arg = args[index]
+        index += 1
+        if not arg.startswith("-"):
+            positional.append(arg)
+            continue
+        if arg not in OPTIONS:
+            raise UsageError(f"Unknown option: {arg}")
+        key, converter = OPTIONS[arg]
+        if converter is None:
+            options[key] = True
+            continue
+        if index == len(args):
+            raise UsageError(f"{arg} expects a value")
+        try:
+            options[key] = converter(args[index])
+        except ValueError:
+            raise UsageError(f"Invalid value for {arg}: {args[index]}")
+        index += 1
+    return positional, options
+
+def single_file(positional):
+    if len(positional) != 1:
+        raise UsageError("Expected exactly one .rgr file")
+    return positional[0]
+
+def execution_limits(options):
+    """ExecutionLimits built from the limit options, or None if none were given."""
+    given = {key: options[key] for key in LIMIT_KEYS if key in options}
+    if not given:
+        return None
+    from limits import ExecutionLimits
+    return ExecutionLimits(**given)
+
+def command_run(args):
+    positional, options = parse_options(args)
+    from context_manager import ContextManager
+    manager = ContextManager(single_file(positional), execution_limits(options), options.get("check", False))
+    return manager.run()
+
+def command_check(args):
+    positional, _ = parse_options(args)
+    file_path = single_file(positional)
+    from linker import Linker
+    from type_checker import TypeChecker
+    try:
+        program = Linker(file_path, prune=False).link()  # Unused declarations are checked too
+    except (OSError, SyntaxError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    result = TypeChecker(program.tokens, program.matches).check()
+    for error in result.errors:
+        print(f"{file_path}: token {error.pos}: {error}", file=sys.stderr)
+    if not result.ok:
+        return 1
+    print(f"{file_path}: ok")
+    return 0
+
+def command_link(args):
+    positional, _ = parse_options(args)
+    file_path = single_file(positional)
+    from linker import Linker, cache_path, read_image, write_image
+    try:
+        image = Linker(file_path).link()
+    except (OSError, SyntaxError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    path = cache_path(file_path)
+    write_image(path, image)
+    cached = read_image(path)
+    if cached is not None:
+        image.report.image_ms = cached.report.image_ms
+        print(f"wrote {path}")
+    print(image.report.format())
+    return 0
+
+class NullInterpreter:
+    """Mixin that discards output and answers every 'ask' with an empty
+    line, so bench times the interpreter only."""
+
+    def write_output(self, text):
+        pass
+
+    def read_input(self):
+        return ""
+
+def bench_script(file_path, runs):
+    """Best-of-`runs` times for each phase of running `file_path`."""
+    from time import perf_counter
+    from linker import Linker
+    from parser import Parser
+    from type_checker import TypeChecker
+    from grammar_parser import Interpreter
+
+    class BenchInterpreter(NullInterpreter, Interpreter):
+        pass
+
+    phases = {"link": [], "check": [], "run": [], "run --check": []}
+    for _ in range(runs):
+        start = perf_counter()
+        program = Linker(file_path).link()  # Lexes every module from source
+        tokens, matches = program.tokens, program.matches
+        phases["link"].append(perf_counter() - start)
+
+        start = perf_counter()
+        checked = TypeChecker(tokens, matches).check()
+        phases["check"].append(perf_counter() - start)
+
+        start = perf_counter()
+        BenchInterpreter(Parser(tokens, matches)).interpret()
+        phases["run"].append(perf_counter() - start)
+
+        if checked.ok:
+            start = perf_counter()
+            BenchInterpreter(Parser(tokens, matches), checked=checked).interpret()
+            phases["run --check"].append(perf_counter() - start)
+    return {phase: min(times) for phase, times in phases.items() if times}
+
+def import_times(command):
+    """(module, cumulative us, nested) for every import `python -X importtime` reports for `command`."""
+    import subprocess
+    result = subprocess.run([sys.executable, "-X", "importtime", *command],
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        errors = [line for line in result.stderr.splitlines() if not line.startswith("import time:")]
+        raise RuntimeError(f"{' '.join(command)} failed: " + "; ".join(errors))
+    times = []
+    for line in result.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"
+        parts = line.split("|")
+        if len(parts) != 3 or not line.startswith("import time:") or not parts[1].strip().isdigit():
+            continue
+        name = parts[2]
+        times.append((name.strip(), int(parts[1]), name.startswith("  ")))
+    return times
+
+def import_time_ms(command):
+    """Total import time in ms that `python -X importtime` reports for `command`."""
+    # Nested imports are already counted in their parent's cumulative time
+    return sum(cumulative for _, cumulative, nested in import_times(command) if not nested) / 1000
+
+def bench_startup(runs):
+    """Import time 'ragar run' adds over a bare interpreter, best of `runs`."""
+    import os
+    import tempfile
+    with tempfile.NamedTemporaryFile("w", suffix=".rgr", delete=False) as script:
+        script.write(STARTUP_SCRIPT)
+    try:
+        baseline = min(import_time_ms(["-c", "pass"]) for _ in range(runs))
+        ragar = min(import_time_ms([os.path.abspath(__file__), "run", script.name]) for _ in range(runs))
+    finally:
+        os.remove(script.name)
+    return baseline, ragar
+
+def command_bench(args):
+    positional, options = parse_options(args)
+    runs = options.get("runs", 5)
+    if runs < 1:
+        raise UsageError("-n expects at least one run")
+    if options.get("startup"):
+        try:
+            baseline, ragar = bench_startup(runs)
+        except RuntimeError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        overhead = ragar - baseline
+        print(f"python startup imports: {baseline:8.2f} ms")
+        print(f"ragar run imports:      {ragar:8.2f} ms")
+        print(f"overhead:               {overhead:8.2f} ms (budget {STARTUP_BUDGET_MS:.2f} ms)")
+        if overhead > STARTUP_BUDGET_MS:
+            print("Startup budget exceeded", file=sys.stderr)
+            return 1
+        return 0
+
+    file_path = single_file(positional)
+    from grammar_parser import REPORTED_ERRORS
+    try:
+        times = bench_script(file_path, runs)
+    except (OSError, *REPORTED_ERRORS) as e:  # As 'ragar run' reports them
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    print(f"{file_path}: best of {runs}")
+    for phase, seconds in times.items():
+        print(f"  {phase:<12}{seconds * 1000:10.3f} ms")
+    return 0
+
+COMMANDS = {
+    "run": command_run,
+    "check": command_check,
+    "link": command_link,
+    "bench": command_bench,
+}
+
+def main(argv=None):
+    args = sys.argv[1:] if argv is None else argv
+    if not args or args[0] in ("-h", "--help"):
+        print(USAGE)
+        return 0 if args else 2
+    if args[0] == "--version":
+        print(f"ragar {VERSION}")
+        return 0
+    command = COMMANDS.get(args[0])
+    try:
+        if command is None:
+            return command_run(args)  # 'ragar.py file.rgr' runs the file
+        return command(args[1:])
+    except UsageError as e:
+        print(f"{e}\n{USAGE}", file=sys.stderr)
+        return 2
+
+if __name__ == "__main__":
+    sys.exit(main())
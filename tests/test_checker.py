@@ -0,0 +1,103 @@
+import os
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from lexer import Lexer
+from parser import Parser
+from grammar_parser import Interpreter
+from type_checker import TypeChecker
+from limits import ExecutionLimits
+from error_handler import RagarRuntimeError, ResourceLimitError
+
+class CapturingInterpreter(Interpreter):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.output = []
+
+    def write_output(self, text):
+        self.output.append(text)
+
+def check(source):
+    lexer = Lexer(source)
+    tokens = lexer.tokenize()
+    return TypeChecker(tokens, lexer.matches).check()
+
+def run(source, limits=None, checked=True):
+    """Runs `source` as 'ragar run --check' would and returns its output lines."""
+    lexer = Lexer(source)
+    tokens = lexer.tokenize()
+    result = TypeChecker(tokens, lexer.matches).check() if checked else None
+    interpreter = CapturingInterpreter(Parser(tokens, lexer.matches), limits, result)
+    interpreter.interpret()
+    return interpreter.output
+
+class CheckerAgreesWithRuntimeTest(unittest.TestCase):
+    """Programs the checker passes must not fail for the reason it checked."""
+
+    def assertCheckFails(self, source, message):
+        result = check(source)
+        self.assertFalse(result.ok)
+        self.assertIn(message, [str(error) for error in result.errors])
+
+    def test_variable_initializer_is_rejected(self):
+        self.assertCheckFails('var y int = 3;\nvar x int = y;\n',
+                              "Cannot initialize from variable y; expected a literal or a call")
+
+    def test_branch_declaration_needs_every_path(self):
+        self.assertCheckFails('var c bool = true;\nif (c) { var late int = 1; }\nif (late > 0) { put {"x"}; }\n',
+                              "Undeclared variable late")
+
+    def test_declaration_on_every_path_counts(self):
+        source = ('var c bool = false;\n'
+                  'if (c) { var v int = 1; } elif (c == false) { var v int = 2; } else { var v int = 3; }\n'
+                  'if (v == 2) { put {"two"}; }\n')
+        self.assertTrue(check(source).ok)
+        self.assertEqual(run(source), ["two"])
+
+    def test_forward_call(self):
+        source = 'var x int = f();\nput {x};\nfunc f() { return {7}; }\n'
+        self.assertTrue(check(source).ok)
+        self.assertEqual(run(source), ["7"])
+
+    def test_func_in_untaken_branch_is_undefined(self):
+        source = ('var c bool = false;\nif (c) { func inner() { return {1}; } }\n'
+                  'var y int = inner();\n')
+        self.assertCheckFails(source, "Undefined func: inner")
+        with self.assertRaisesRegex(SyntaxError, "Undefined func: inner"):
+            run(source, checked=False)
+
+    def test_native_arguments_of_unknown_type_are_checked(self):
+        source = ('import {_object};\nfunc g(a) { var k list = keys(a); return {k}; }\n'
+                  'var r list = g(5);\n')
+        self.assertTrue(check(source).ok)
+        with self.assertRaisesRegex(TypeError, "keys\\(\\) expects dict but got 5"):
+            run(source)
+
+    def test_typed_native_call_skips_argument_check(self):
+        source = 'import {_object};\nvar d dict = {"a": 1};\nvar k list = keys(d);\nput {k};\n'
+        result = check(source)
+        self.assertEqual(len(result.typed_calls), 1)
+        self.assertEqual(run(source), ["['a']"])
+
+    def test_condition_cannot_reach_python_builtins(self):
+        source = 'if (exec("x = 1")) { put {"x"}; }\n'
+        self.assertCheckFails(source, "Cannot call exec in a condition")
+        with self.assertRaisesRegex(RagarRuntimeError, "name 'exec' is not defined"):
+            run(source, checked=False)
+
+    def test_power_operator_is_rejected(self):
+        with self.assertRaises(SyntaxError):
+            run('var x int = 3;\nif (2 * * x == 8) { put {"x"}; }\n', checked=False)
+
+    def test_repetition_is_bounded(self):
+        source = 'if (len("ab" * 300000000) > 0) { put {"big"}; }\n'
+        with self.assertRaises(ResourceLimitError):
+            run(source, ExecutionLimits(max_value_bytes=1000), checked=False)
+        self.assertEqual(run('if (len("ab" * 3) == 6) { put {"ok"}; }\n', ExecutionLimits(max_value_bytes=1000),
+                             checked=False), ["ok"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import os
+import sys
+import tempfile
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from linker import Linker, cache_path, load_program, read_image, write_image
+
+MAIN = 'import {util};\nvar x int = used(1);\nput {x};\n'
+UTIL = ('func used(n) { return {n}; }\n'
+        'func unused(n) { return {n}; }\n'
+        'var table list = [1, 2, 3];\n')
+
+class LinkerTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def write(self, name, source, directory=None):
+        path = os.path.join(directory or self.directory.name, name)
+        with open(path, "w") as file:
+            file.write(source)
+        return path
+
+    def test_prunes_unreachable_declarations(self):
+        main = self.write("main.rgr", MAIN)
+        self.write("util.rgr", UTIL)
+        image = Linker(main).link()
+        self.assertEqual(sorted(image.report.dropped),
+                         [("util.rgr", "func", "unused"), ("util.rgr", "var", "table")])
+        self.assertNotIn("unused", [token.value for token in image.tokens])
+
+    def test_keeps_everything_without_pruning(self):
+        main = self.write("main.rgr", MAIN)
+        self.write("util.rgr", UTIL)
+        image = Linker(main, prune=False).link()
+        self.assertEqual(image.report.dropped, [])
+
+    def test_missing_module(self):
+        main = self.write("main.rgr", 'import {nowhere};\n')
+        with self.assertRaisesRegex(SyntaxError, "Module not found: nowhere"):
+            Linker(main).link()
+
+    def test_reuses_cached_image(self):
+        main = self.write("main.rgr", MAIN)
+        self.write("util.rgr", UTIL)
+        linked = load_program(main)
+        self.assertIsNone(linked.report.image_ms)
+        cached = load_program(main)
+        self.assertIsNotNone(cached.report.image_ms)
+        self.assertEqual([(token.type, token.value) for token in cached.tokens],
+                         [(token.type, token.value) for token in linked.tokens])
+
+    def test_changed_module_invalidates_image(self):
+        main = self.write("main.rgr", MAIN)
+        util = self.write("util.rgr", UTIL)
+        load_program(main)
+        self.write("util.rgr", UTIL.replace("return {n}", "return {n + 1}", 1))
+        stat = os.stat(util)
+        os.utime(util, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))  # Also on a coarse clock
+        self.assertIsNone(read_image(cache_path(main)))
+        self.assertIn("+", [token.value for token in load_program(main).tokens])
+
+    def test_same_size_edit_invalidates_image(self):
+        main = self.write("main.rgr", MAIN)
+        util = self.write("util.rgr", UTIL)
+        load_program(main)
+        stat = os.stat(util)
+        self.write("util.rgr", UTIL.replace("[1, 2, 3]", "[4, 5, 6]"))
+        os.utime(util, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        self.assertEqual(os.stat(util).st_size, stat.st_size)
+        self.assertIsNone(read_image(cache_path(main)))
+
+    def test_module_appearing_at_probed_path_invalidates_image(self):
+        library = os.path.join(self.directory.name, "lib")
+        os.mkdir(library)
+        main = self.write("main.rgr", MAIN)
+        self.write("util.rgr", UTIL, library)
+        image = Linker(main, search_path=[library]).link()
+        shadow = os.path.join(self.directory.name, "util.rgr")
+        self.assertIn(shadow, image.probed)
+
+        path = cache_path(main)
+        write_image(path, image)
+        self.assertIsNotNone(read_image(path))
+        self.write("util.rgr", UTIL)  # Now found next to main.rgr first
+        self.assertIsNone(read_image(path))
+
+if __name__ == "__main__":
+    unittest.main()
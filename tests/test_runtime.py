@@ -0,0 +1,104 @@
+import os
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from lexer import LAZY_THRESHOLD, Lexer, TokenType
+from parser import Parser
+from grammar_parser import Interpreter
+from limits import ExecutionLimits
+from literals import LazyLiteral, decode_list
+from error_handler import OutputLimitExceeded, StatementLimitExceeded, ValueSizeLimitExceeded
+
+class CapturingInterpreter(Interpreter):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.output = []
+
+    def write_output(self, text):
+        self.output.append(text)
+
+def interpreter_for(source, limits=None):
+    lexer = Lexer(source)
+    tokens = lexer.tokenize()
+    return CapturingInterpreter(Parser(tokens, lexer.matches), limits)
+
+def run(source, limits=None):
+    interpreter = interpreter_for(source, limits)
+    interpreter.interpret()
+    return interpreter
+
+class LimitsTest(unittest.TestCase):
+    def test_statement_limit(self):
+        source = 'func down(n) { if (n > 0) { var r int = down(n - 1); } return {n}; }\nvar x int = down(50);\n'
+        with self.assertRaises(StatementLimitExceeded):
+            run(source, ExecutionLimits(max_statements=20, check_interval=4))
+        run(source, ExecutionLimits(max_statements=1000))
+
+    def test_output_limit(self):
+        with self.assertRaises(OutputLimitExceeded):
+            run('put {"0123456789"};\nput {"0123456789"};\n', ExecutionLimits(max_output_bytes=15))
+
+    def test_value_limit(self):
+        with self.assertRaises(ValueSizeLimitExceeded):
+            run('var s string = "%s";\n' % ("x" * 2000), ExecutionLimits(max_value_bytes=1000))
+
+    def test_frame_locals_are_released(self):
+        source = ('func f(n) { var s string = "abcdefghij"; if (n > 0) { var r int = f(n - 1); } return {n}; }\n'
+                  'var a int = f(40);\n')
+        budget = run(source, ExecutionLimits(max_value_bytes=10**6)).budget
+        self.assertEqual(list(budget.value_sizes), ["a"])
+        self.assertEqual(budget.value_bytes, budget.value_sizes["a"])
+
+class MemoTest(unittest.TestCase):
+    def test_pure_func_is_memoized(self):
+        source = ('pure func fib(n) { if (n < 2) { return {n}; } return {fib(n - 1) + fib(n - 2)}; }\n'
+                  'var x int = fib(30);\nput {x};\n')
+        interpreter = run(source)
+        self.assertEqual(interpreter.output, ["832040"])
+        info = interpreter.functions["fib"].cache_info()
+        self.assertEqual(info.misses, 31)
+
+    def test_memo_keeps_int_and_float_apart(self):
+        source = ('pure func same(n) { return {n}; }\n'
+                  'var a int = same(1);\nvar b float = same(1.0);\nput {a};\nput {b};\n')
+        self.assertEqual(run(source).output, ["1", "1.0"])
+
+class LiteralsTest(unittest.TestCase):
+    def test_homogeneous_lists_are_packed(self):
+        self.assertEqual(decode_list("[1, 2, -3]").typecode, "q")
+        self.assertEqual(decode_list("[1.5, 2.25]").typecode, "d")
+        self.assertEqual(decode_list("[1, 2, 3]"), [1, 2, 3])
+        self.assertEqual(str(decode_list("[1.5, 2.25]")), "[1.5, 2.25]")
+
+    def test_mixed_numbers_stay_a_list(self):
+        value = decode_list("[1, 2.5]")
+        self.assertIs(type(value), list)
+        self.assertEqual(str(value), "[1, 2.5]")
+
+    def test_wide_ints_stay_a_list(self):
+        self.assertEqual(decode_list("[99999999999999999999, 1]"), [99999999999999999999, 1])
+
+    def test_invalid_numbers_are_rejected(self):
+        for text in ("[1e5]", '[1e5, "a"]', "[1.]", "[.5]", "[1,,2]", "[1 2]"):
+            with self.assertRaises(SyntaxError, msg=text):
+                decode_list(text)
+
+    def test_large_dict_is_one_lazy_token(self):
+        entries = ", ".join(f'"k{i}": [{i}, "a;}}b"]' for i in range(LAZY_THRESHOLD // 10))
+        source = f'var d dict = {{{entries}}};\nif (d["k3"][0] == 3) {{ put {{"found"}}; }}\n'
+        tokens = Lexer(source).tokenize()
+        self.assertEqual(tokens[4].type, TokenType.DICT)
+        self.assertLess(len(tokens), 40)
+
+        interpreter = interpreter_for(source)
+        interpreter.execute_statement()
+        self.assertIsInstance(interpreter.variables["d"], LazyLiteral)
+        interpreter.interpret()
+        self.assertEqual(interpreter.output, ["found"])
+        self.assertEqual(interpreter.variables["d"]["k3"], [3, "a;}b"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,31 @@
+import os
+import sys
+import tempfile
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import ragar
+
+# Modules 'ragar run' avoids importing for a script without imports or pure funcs
+HEAVY_MODULES = {"re", "enum", "functools", "asyncio", "type_checker", "libraries"}
+
+class StartupTest(unittest.TestCase):
+    def test_run_stays_within_startup_budget(self):
+        baseline, run = ragar.bench_startup(runs=5)
+        self.assertLessEqual(run - baseline, ragar.STARTUP_BUDGET_MS,
+                             f"'ragar run' imports take {run:.2f} ms against {baseline:.2f} ms for bare Python")
+
+    def test_run_skips_heavy_modules(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".rgr", delete=False) as script:
+            script.write(ragar.STARTUP_SCRIPT)
+        try:
+            baseline = {name for name, _, _ in ragar.import_times(["-c", "pass"])}
+            run = {name for name, _, _ in ragar.import_times([os.path.join(ROOT, "ragar.py"), "run", script.name])}
+        finally:
+            os.remove(script.name)
+        self.assertEqual((run - baseline) & HEAVY_MODULES, set())
+
+if __name__ == "__main__":
+    unittest.main()
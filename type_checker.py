@@ -0,0 +1,468 @@
+from lexer import TokenType
+from parser import CALL_TOKENS, Parser, compile_expression, condition_source
+from error_handler import TypeCheckError
+from libraries import LIBRARIES
+
+# Literal token type -> RAGAR type name
+LITERAL_TYPES = {
+    TokenType.NUMBER: "int",
+    TokenType.FLOAT: "float",
+    TokenType.STRING: "string",
+    TokenType.BOOL: "bool",
+}
+NUMERIC = {"int", "float"}
+COMPARISONS = {"<", ">", "==", "<=", ">="}
+# Python built-ins a condition may call, and what they return (None: unknown);
+# the interpreter only exposes these (parser.SAFE_BUILTINS)
+CONDITION_BUILTINS = {"len": "int", "abs": None, "min": None, "max": None,
+                      "str": "string", "int": "int", "float": "float"}
+SUBSCRIPTABLE = {"list", "dict", "string"}
+
+class CheckResult:
+    """Outcome of a TypeChecker run.
+
+    When `ok`, the interpreter can use `declarations` (pre-converted literal
+    values) and `conditions` (pre-compiled conditions) instead of converting
+    and compiling at run time, and call built-ins at `typed_calls` without
+    checking their arguments.
+    """
+
+    def __init__(self, errors, variable_types, declarations, conditions, typed_calls):
+        self.errors = errors
+        self.variable_types = variable_types
+        self.declarations = declarations  # 'var' token index -> (name, value, next index)
+        self.conditions = conditions      # '(' token index -> code object
+        self.typed_calls = typed_calls    # Name token indexes of built-in calls with checked argument types
+
+    @property
+    def ok(self):
+        return not self.errors
+
+class TypeChecker:
+    """Infers and verifies the types of a whole program before it runs.
+
+    Every statement is checked, so one pass reports all type errors.
+    """
+
+    def __init__(self, tokens, matches=None):
+        self.parser = Parser(tokens, matches)
+        self.types = {}  # Variable name -> declared type (None when unknown, e.g. func parameters)
+        self.functions = {}  # Func name -> arity
+        self.natives = {}    # Imported built-in name -> NativeFunction
+        self.in_function = False
+        self.errors = []
+        self.declarations = {}
+        self.conditions = {}
+        self.typed_calls = set()
+
+    def error(self, message, pos=None):
+        self.errors.append(TypeCheckError(message, self.parser.pos if pos is None else pos))
+
+    def check(self):
+        """Checks the whole program and returns a CheckResult."""
+        self.collect_functions()
+        while self.parser.current_token.type != TokenType.EOF:
+            self.check_statement()
+        return CheckResult(self.errors, self.types, self.declarations, self.conditions, self.typed_calls)
+
+    def check_statement(self):
+        start = self.parser.pos
+        token = self.parser.current_token
+        try:
+            if token.value == "var":
+                self.check_variable_declaration()
+            elif token.value == "put":
+                self.check_put()
+            elif token.value == "ask":
+                var_name = self.parser.parse_ask()
+                self.declare(var_name, "string", start)
+            elif token.value == "if":
+                self.check_if()
+            elif token.value == "import":
+                mod = self.parser.parse_import()
+                library = LIBRARIES.get(mod)
+                if library is None:
+                    raise SyntaxError(f"Module not found: {mod}")
+                self.natives.update(library.functions)
+            elif token.value in ("func", "pure"):
+                self.check_function_declaration()
+            elif token.value == "return":
+                self.check_return()
+            elif self.parser.is_call():
+                self.check_call()
+                self.parser.require_semicolon()
+            else:
+                raise SyntaxError(f"Unexpected token: {token}")
+        except SyntaxError as e:
+            # Record it and resume after the broken statement
+            self.error(str(e), start)
+            self.parser.jump(start)
+            try:
+                self.parser.skip_statement()
+            except SyntaxError:
+                self.parser.jump(len(self.parser.tokens) - 1)  # Nothing to resume at, stop at EOF
+
+    def declare(self, var_name, var_type, pos):
+        declared = self.types.get(var_name)
+        if declared is not None and declared != var_type:
+            self.error(f"Variable {var_name} redeclared as {var_type} (was {declared})", pos)
+        else:
+            self.types[var_name] = var_type
+
+    def check_variable_declaration(self):
+        start = self.parser.pos
+        self.parser.eat(TokenType.KEYWORD)  # Eat 'var'
+        var_name = self.parser.current_token.value
+        self.parser.eat(TokenType.IDENTIFIER)
+        if self.parser.current_token.type != TokenType.TYPE:
+            raise SyntaxError(f"Expected a type, but got {self.parser.current_token}")
+        var_type = self.parser.current_token.value
+        self.parser.next_token()
+        self.parser.eat(TokenType.OPERATOR)  # Eat '='
+
+        value_token = self.parser.current_token
+        if self.parser.is_call():
+            # Funcs are untyped (the interpreter checks their result when the
+            # declaration runs); built-ins declare theirs
+            value_type = self.check_call()
+        else:
+            value_type = self.infer_value(value_token)
+        if value_type is not None and value_type != var_type:
+            self.error(f"Type mismatch: {var_name} is {var_type} but got {value_type} {value_token.value}")
+        self.declare(var_name, var_type, start)
+
+        self.parser.jump(start)
+        if value_token.type in LITERAL_TYPES and value_type == var_type:
+            # Let the real parser convert the literal once, here, instead of on every run
+            _, _, value = self.parser.parse_variable_declaration()
+            self.declarations[start] = (var_name, value, self.parser.pos)
+        elif value_type in ("list", "dict") and value_type == var_type:
+            self.parser.parse_variable_declaration()  # Validates the literal (large ones stay lazy)
+        else:
+            self.parser.skip_statement()
+
+    def infer_value(self, token):
+        """Type of the value a declaration starts with, or None if unknown."""
+        if token.type in LITERAL_TYPES:
+            return LITERAL_TYPES[token.type]
+        if token.type == TokenType.LIST or token.value == "[":
+            return "list"
+        if token.type == TokenType.DICT or token.value == "{":
+            return "dict"
+        if token.type == TokenType.IDENTIFIER:
+            # The parser only takes a literal or a call here
+            self.error(f"Cannot initialize from variable {token.value}; expected a literal or a call")
+            return None
+        self.error(f"Invalid value {token.value}")
+        return None
+
+    def lookup(self, token):
+        if token.value not in self.types:
+            self.error(f"Undeclared variable {token.value}")
+            return None
+        return self.types[token.value]
+
+    def collect_functions(self):
+        """Records every top-level func's arity up front; the interpreter defines
+        these before running, so calls may precede their declarations."""
+        for pos in self.parser.top_level_functions():
+            self.parser.jump(pos)
+            try:
+                name, params, _, _ = self.parser.parse_function_declaration()
+            except SyntaxError:
+                continue  # Reported when the declaration itself is checked
+            self.functions[name] = len(params)
+        self.parser.jump(0)
+
+    def check_function_declaration(self):
+        name, params, body_pos, _ = self.parser.parse_function_declaration()
+        end = self.parser.pos
+        self.functions[name] = len(params)  # A func in a block exists once its declaration runs
+
+        # Parameters, locals and nested funcs are only visible inside the body
+        outer_types, outer_functions, outer_in_function = self.types, self.functions, self.in_function
+        self.types, self.functions = dict(outer_types), dict(outer_functions)
+        for param in params:
+            self.types[param] = None
+        self.in_function = True
+        self.parser.jump(body_pos)
+        try:
+            self.check_block()
+        finally:
+            self.types, self.functions, self.in_function = outer_types, outer_functions, outer_in_function
+            self.parser.jump(end)
+
+    def check_call(self):
+        """Checks a call's target and arguments; returns its result type if known."""
+        start = self.parser.pos
+        call = self.parser.parse_call()
+        arg_types = [ExpressionChecker(self, item, start).check() for item in call.args]
+
+        native = self.natives.get(call.name) if call.name not in self.functions else None
+        if native is not None:
+            arity = native.arity
+            for declared, actual in zip(native.arg_types, arg_types):
+                if actual is not None and declared != "any" and declared != actual \
+                        and not (declared == "float" and actual == "int"):
+                    self.error(f"{call.name}() expects {declared} but got {actual}", start)
+            # Arguments of unknown type (func parameters and results) are still checked at run time
+            if all(actual is not None or declared == "any" for declared, actual in zip(native.arg_types, arg_types)):
+                self.typed_calls.add(start)
+        else:
+            arity = self.functions.get(call.name)
+        if arity is None:
+            self.error(f"Undefined func: {call.name}", start)
+        elif arity != len(call.args):
+            self.error(f"{call.name}() takes {arity} arguments but {len(call.args)} were given", start)
+        return native.returns if native is not None else None
+
+    def check_return(self):
+        start = self.parser.pos
+        expression = self.parser.parse_return()
+        if not self.in_function:
+            self.error("'return' outside func", start)
+        if expression:
+            ExpressionChecker(self, expression, start).check()
+
+    def check_put(self):
+        start = self.parser.pos
+        self.parser.next_token()  # Skip 'put'
+        if self.parser.at("{"):
+            argument = self.parser.tokens[self.parser.pos + 1]
+            if argument.type == TokenType.IDENTIFIER:
+                self.lookup(argument)
+        self.parser.jump(start)
+        self.parser.parse_put()
+
+    def check_if(self):
+        """Checks an if/elif/else chain. A variable or func declared in a branch
+        stays declared afterwards only if every branch, including an 'else',
+        declares it."""
+        start = self.parser.pos
+        outer_types, outer_functions = self.types, self.functions
+        branches = []  # (variable types, func arities) at the end of each branch
+        try:
+            self.check_condition()
+            branches.append(self.check_branch(outer_types, outer_functions))
+            while self.parser.at("elif"):
+                self.check_condition()
+                branches.append(self.check_branch(outer_types, outer_functions))
+            if not self.parser.at("else"):
+                return
+            self.parser.eat(TokenType.KEYWORD)  # Eat 'else'
+            branches.append(self.check_branch(outer_types, outer_functions))
+        finally:
+            self.types, self.functions = outer_types, outer_functions
+        all_types = [types for types, _ in branches]
+        for name in set(all_types[0]).intersection(*all_types[1:]) - set(outer_types):
+            for types in all_types:
+                self.declare(name, types[name], start)
+        for name, arity in branches[0][1].items():
+            if all(functions.get(name) == arity for _, functions in branches):
+                self.functions[name] = arity
+
+    def check_branch(self, outer_types, outer_functions):
+        self.types, self.functions = dict(outer_types), dict(outer_functions)
+        self.check_block()
+        return self.types, self.functions
+
+    def check_block(self):
+        if self.parser.at("{"):
+            end = self.parser.matches[self.parser.pos]
+            self.parser.eat(TokenType.SYMBOL)  # Eat '{'
+            while self.parser.pos < end:
+                self.check_statement()
+            self.parser.eat(TokenType.SYMBOL)  # Eat '}'
+        else:
+            self.check_statement()
+
+    def check_condition(self):
+        open_pos = self.parser.pos + 1  # Index of '('
+        condition_tokens = self.parser.parse_if_statement()
+        errors_before = len(self.errors)
+        if not condition_tokens:
+            self.error("Empty condition", open_pos)
+        else:
+            ExpressionChecker(self, condition_tokens, open_pos).check()
+        if len(self.errors) == errors_before:
+            source = condition_source(condition_tokens)
+            try:
+                self.conditions[open_pos] = compile_expression(source, "<condition>")
+            except SyntaxError:
+                self.error(f"Invalid condition: {source}", open_pos)
+
+class ExpressionChecker:
+    """Recursive-descent type inference over the tokens of one condition."""
+
+    def __init__(self, checker, tokens, pos):
+        self.checker = checker
+        self.tokens = tokens
+        self.index = 0
+        self.pos = pos
+
+    def error(self, message):
+        self.checker.error(message, self.pos)
+
+    def peek(self):
+        return self.tokens[self.index] if self.index < len(self.tokens) else None
+
+    def check(self):
+        """Checks the expression and returns its type (None if unknown)."""
+        result = self.logical()
+        if self.index < len(self.tokens):
+            self.error(f"Unexpected {self.tokens[self.index].value} in condition")
+        return result
+
+    def operator(self, choices):
+        """Consumes an operator in `choices` (joining '<' '=' into '<='), or returns None."""
+        token = self.peek()
+        if token is None or token.type != TokenType.OPERATOR:
+            return None
+        following = self.tokens[self.index + 1] if self.index + 1 < len(self.tokens) else None
+        if following is not None and following.type == TokenType.OPERATOR and token.value + following.value in choices:
+            self.index += 2
+            return token.value + following.value
+        if token.value in choices:
+            self.index += 1
+            return token.value
+        return None
+
+    def keyword(self, word):
+        """Consumes the word operator `word` ('and', 'or', 'not') if it is next."""
+        token = self.peek()
+        if token is not None and token.type == TokenType.IDENTIFIER and token.value == word:
+            self.index += 1
+            return True
+        return False
+
+    def logical(self):
+        result = self.negation()
+        while self.keyword("and") or self.keyword("or"):
+            self.negation()
+            result = "bool"
+        return result
+
+    def negation(self):
+        if self.keyword("not"):
+            self.negation()
+            return "bool"
+        return self.comparison()
+
+    def comparison(self):
+        left = self.arithmetic()
+        op = self.operator(COMPARISONS)
+        if op is None:
+            if self.peek() is not None and self.peek().value == "=":
+                self.error("Assignment '=' in condition, did you mean '=='?")
+                self.index += 1
+                self.arithmetic()
+                return "bool"
+            return left
+        right = self.arithmetic()
+        if left is None or right is None:
+            return "bool"
+        if op == "==":
+            if (left in NUMERIC) != (right in NUMERIC) or (left not in NUMERIC and left != right):
+                self.error(f"Cannot compare {left} with {right}")
+        elif not ((left in NUMERIC and right in NUMERIC) or left == right == "string"):
+            self.error(f"Cannot order {left} and {right} with '{op}'")
+        return "bool"
+
+    def arithmetic(self):
+        left = self.term()
+        while True:
+            op = self.operator({"+", "-"})
+            if op is None:
+                return left
+            right = self.term()
+            left = self.combine(op, left, right)
+
+    def term(self):
+        left = self.atom()
+        while True:
+            op = self.operator({"*", "/"})
+            if op is None:
+                return left
+            right = self.atom()
+            left = self.combine(op, left, right)
+
+    def combine(self, op, left, right):
+        if left is None or right is None:
+            return None
+        if left in NUMERIC and right in NUMERIC:
+            if op == "/" or "float" in (left, right):
+                return "float"
+            return "int"
+        if op == "+" and left == right and left in ("string", "list"):
+            return left
+        self.error(f"Unsupported operand types for '{op}': {left} and {right}")
+        return None
+
+    def atom(self):
+        token = self.peek()
+        if token is None:
+            self.error("Incomplete condition")
+            return None
+        self.index += 1
+        if token.type in LITERAL_TYPES:
+            return LITERAL_TYPES[token.type]
+        following = self.peek()
+        if token.type in CALL_TOKENS and following is not None and following.value == "(":
+            return self.builtin_call(token)
+        if token.type == TokenType.IDENTIFIER:
+            return self.subscripts(self.checker.lookup(token))
+        if token.type == TokenType.OPERATOR and token.value == "-":
+            operand = self.atom()
+            if operand is not None and operand not in NUMERIC:
+                self.error(f"Cannot negate {operand}")
+            return operand
+        if token.type == TokenType.LIST:
+            return self.subscripts("list")
+        if token.value == "[":
+            self.index -= 1
+            self.skip_group()  # Nested list literal
+            return self.subscripts("list")
+        if token.value == "(":
+            inner = self.logical()
+            if self.peek() is None or self.peek().value != ")":
+                self.error("Expected ')' in condition")
+            else:
+                self.index += 1
+            return inner
+        self.error(f"Unexpected {token.value} in condition")
+        return None
+
+    def skip_group(self):
+        """Skips a bracketed group starting at the current token."""
+        depth = 0
+        while self.index < len(self.tokens):
+            value = self.tokens[self.index].value
+            self.index += 1
+            if value in ("(", "["):
+                depth += 1
+            elif value in (")", "]"):
+                depth -= 1
+                if depth == 0:
+                    return
+
+    def builtin_call(self, token):
+        self.skip_group()
+        if token.value in self.checker.functions:
+            return None  # Funcs are untyped
+        if token.value in self.checker.natives:
+            return self.checker.natives[token.value].returns
+        if token.value not in CONDITION_BUILTINS:
+            self.error(f"Cannot call {token.value} in a condition")
+        return CONDITION_BUILTINS.get(token.value)
+
+    def subscripts(self, value_type):
+        """Consumes any '[...]' subscripts after a value; their result is unknown."""
+        while self.peek() is not None and (self.peek().type == TokenType.LIST or self.peek().value == "["):
+            if value_type is not None and value_type not in SUBSCRIPTABLE:
+                self.error(f"Cannot index {value_type}")
+            if self.peek().type == TokenType.LIST:
+                self.index += 1
+            else:
+                self.skip_group()
+            value_type = None
+        return value_type